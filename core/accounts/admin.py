@@ -1,24 +1,55 @@
 from django.contrib import admin
 from django.utils.html import format_html
-from .models import Lay, DepositAddress, DepositRotation, WithdrawRequest, WeeklyBonus
+from core.changelists import LargeTableAdminMixin
+from core.db_router import ReplicaChangeListMixin
+from core.money import money_display
+from .settlement import settle_lays
+from .models import LayStatus, Lay, DepositAddress, DepositRotation, WithdrawRequest, WeeklyBonus, WeeklySettlement
 
 
 @admin.register(Lay)
-class LayAdmin(admin.ModelAdmin):
+class LayAdmin(ReplicaChangeListMixin, LargeTableAdminMixin, admin.ModelAdmin):
     list_display = (
-        "id", "user", "total_odds", "stake_amount", "win_payout",
-        "loss_payout", "status", "created_at", "image_tag"
+        "id", "user", "total_odds", "stake", "win", "loss",
+        "status", "created_at", "image_tag"
     )
-    list_filter = ("status", "created_at")
+    list_select_related = ("user",)
+    list_only = (
+        "id", "user__email", "total_odds", "stake_amount", "win_payout",
+        "loss_payout", "status", "created_at", "file", "thumbnail",
+    )
+    list_filter = ("status", "upload_failed", "created_at")
+    date_hierarchy = "created_at"
+    # Both served by trigram indexes (accounts 0020, authentication 0007)
     search_fields = ("user__email", "file_name")
-    readonly_fields = ("id", "created_at", "image_tag", "file")
+    ordering = ("-created_at",)
+    readonly_fields = ("id", "created_at", "image_tag", "file", "preview", "thumbnail")
+    actions = ("approve_lays", "decline_lays")
+
+    stake = money_display("stake_amount")
+    win = money_display("win_payout")
+    loss = money_display("loss_payout")
 
     def image_tag(self, obj):
-        if obj.file:
-            return format_html('<img src="{}" width="100" style="object-fit:contain;" />', obj.file.url)
+        image = obj.thumbnail or obj.file
+        if image:
+            return format_html('<img src="{}" width="100" style="object-fit:contain;" />', image.url)
         return "-"
     image_tag.short_description = "Preview"
 
+    def _settle(self, request, queryset, status):
+        result = settle_lays(queryset, status)
+        self.message_user(
+            request, f"Settled {result.settled} lays for {result.users} users as {status}.")
+
+    @admin.action(description="Approve selected lays")
+    def approve_lays(self, request, queryset):
+        self._settle(request, queryset, LayStatus.APPROVED)
+
+    @admin.action(description="Decline selected lays")
+    def decline_lays(self, request, queryset):
+        self._settle(request, queryset, LayStatus.DECLINED)
+
 
 @admin.register(DepositAddress)
 class DepositAddressAdmin(admin.ModelAdmin):
@@ -34,11 +65,39 @@ class DepositRotationAdmin(admin.ModelAdmin):
 
 
 @admin.register(WithdrawRequest)
-class WithdrawRequestAdmin(admin.ModelAdmin):
-    list_display = ("user", "amount", "address", "created_at")
-    search_fields = ("user__email", "address")
+class WithdrawRequestAdmin(ReplicaChangeListMixin, LargeTableAdminMixin, admin.ModelAdmin):
+    list_display = ("user", "withdraw_amount", "address", "created_at")
+    list_select_related = ("user",)
+    list_only = ("id", "user__email", "amount", "address", "created_at")
+    # Addresses are pasted whole; "=" keeps the lookup on the address index
+    search_fields = ("user__email", "=address")
     list_filter = ("created_at",)
+    date_hierarchy = "created_at"
+    ordering = ("-created_at",)
     readonly_fields = ("created_at",)
 
+    withdraw_amount = money_display("amount")
+
+
+@admin.register(WeeklyBonus)
+class WeeklyBonusAdmin(ReplicaChangeListMixin, LargeTableAdminMixin, admin.ModelAdmin):
+    list_display = ("user", "week_start", "week_end", "balance", "reward")
+    list_select_related = ("user",)
+    list_only = ("id", "user__email", "week_start", "week_end",
+                 "weekly_balance", "weekly_reward")
+    date_hierarchy = "week_start"
+    search_fields = ("user__email",)
+    ordering = ("-week_start",)
+
+    balance = money_display("weekly_balance")
+    reward = money_display("weekly_reward")
+
+
+@admin.register(WeeklySettlement)
+class WeeklySettlementAdmin(ReplicaChangeListMixin, admin.ModelAdmin):
+    list_display = ("week_start", "bonuses_reset", "users_credited",
+                    "credited", "duration_ms", "settled_at")
+    ordering = ("-week_start",)
+    readonly_fields = ("settled_at",)
 
-admin.site.register(WeeklyBonus)
+    credited = money_display("total_credited", "total credited")
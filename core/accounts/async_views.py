@@ -0,0 +1,110 @@
+"""
+Async versions of the account read endpoints, routed instead of the DRF
+views when the app is served by core.asgi (settings.ASYNC_MODE).
+
+DRF's APIView is sync only, so these are plain Django async views. They
+authenticate with the same DRF authentication classes and render with the
+same JSON renderer, so clients see identical responses in both modes.
+Blocking work runs through sync_to_async; a request waiting on it no
+longer holds a whole worker.
+"""
+import logging
+
+from asgiref.sync import sync_to_async
+from django.http import HttpResponse, StreamingHttpResponse
+from django.views import View
+from rest_framework import exceptions, status
+from rest_framework.renderers import JSONRenderer
+from rest_framework.settings import api_settings
+
+from .caching import account_version
+from .conditional import conditional_account_get
+from .deposits import next_deposit_address
+from .events import account_event_stream
+from .serializers import WeeklyBonusSerializer
+from .summary import acurrent_weekly_bonus, aget_account_summary
+
+logger = logging.getLogger(__name__)
+
+
+def render(data, status=status.HTTP_200_OK):
+    return HttpResponse(
+        JSONRenderer().render(data), status=status,
+        content_type="application/json")
+
+
+class AsyncAccountView(View):
+    """Base for async endpoints that require an authenticated user."""
+    authentication_classes = api_settings.DEFAULT_AUTHENTICATION_CLASSES
+
+    def authenticate(self, request):
+        for authentication_class in self.authentication_classes:
+            user_auth = authentication_class().authenticate(request)
+            if user_auth is not None:
+                return user_auth[0]
+        return None
+
+    async def dispatch(self, request, *args, **kwargs):
+        try:
+            user = await sync_to_async(self.authenticate)(request)
+        except exceptions.AuthenticationFailed as exc:
+            return self.permission_denied(request, exc)
+        if user is None:
+            return self.permission_denied(request, exceptions.NotAuthenticated())
+        request.user = user
+        return await super().dispatch(request, *args, **kwargs)
+
+    def permission_denied(self, request, exc):
+        # Same response DRF's exception handler gives the sync views
+        header = self.authentication_classes[0]().authenticate_header(request)
+        if not header:
+            return render({"detail": exc.detail}, status=status.HTTP_403_FORBIDDEN)
+        response = render({"detail": exc.detail}, status=exc.status_code)
+        response["WWW-Authenticate"] = header
+        return response
+
+
+class AccountInfoView(AsyncAccountView):
+
+    @conditional_account_get
+    async def get(self, request):
+        return render(
+            await aget_account_summary(request.user, request.account_version))
+
+
+class CurrentWeeklyBonusView(AsyncAccountView):
+
+    @conditional_account_get
+    async def get(self, request):
+        """Current week’s record, without writing (see current_weekly_bonus)"""
+        bonus = await acurrent_weekly_bonus(request.user)
+        return render(WeeklyBonusSerializer(bonus).data)
+
+
+class GenerateDepositAddressView(AsyncAccountView):
+
+    async def get(self, request):
+        try:
+            address = await sync_to_async(next_deposit_address)()
+            return render({"address": address})
+        except Exception:
+            logger.exception("Error generating deposit address")
+            return render(
+                {"detail": "Unexpected error has happend!"},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+
+class AccountEventsView(AsyncAccountView):
+    """
+    Server-sent events with the user's lay, balance and settlement updates
+    (see accounts.events), so clients no longer need to poll AccountInfoView.
+    """
+
+    async def get(self, request):
+        version = await sync_to_async(account_version)(request.user.pk)
+        return StreamingHttpResponse(
+            account_event_stream(request.user.pk, version),
+            content_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
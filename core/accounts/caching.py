@@ -0,0 +1,75 @@
+import time
+import uuid
+
+from django.core.cache import cache
+from django.db import transaction
+
+
+def new_version():
+    """
+    "<microseconds since epoch, hex>-<random>". The random part means an
+    evicted key can never come back as a version some worker has already
+    seen; the time part doubles as the last-modified marker.
+    """
+    return f"{time.time_ns() // 1000:x}-{uuid.uuid4().hex[:12]}"
+
+
+def version_timestamp(version):
+    """Unix time (seconds) at which `version` was issued."""
+    stamp, sep, _ = version.partition("-")
+    try:
+        if sep:
+            return int(stamp, 16) / 1_000_000
+    except ValueError:
+        pass
+    # Token without a time part: treat it as changed just now
+    return time.time()
+
+
+def get_version(key):
+    """Current version token stored under `key` in the shared cache."""
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, new_version(), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def bump_version(key):
+    """
+    Invalidate everything derived from `key`. Bumped immediately and again on
+    commit, so readers that rebuild from pre-commit data mid-transaction are
+    invalidated as well.
+    """
+    def bump():
+        cache.set(key, new_version(), timeout=None)
+
+    bump()
+    transaction.on_commit(bump)
+
+
+# Account summaries are versioned per user plus one global epoch that bulk
+# jobs (weekly settlement) bump instead of touching every user's key.
+ACCOUNT_EPOCH_KEY = "accounts:summary_epoch"
+
+
+def account_version_key(user_id):
+    return f"accounts:summary_version:{user_id}"
+
+
+def account_version(user_id):
+    """Version token for everything shown on the user's dashboard."""
+    return f"{get_version(ACCOUNT_EPOCH_KEY)}.{get_version(account_version_key(user_id))}"
+
+
+def account_last_modified(version):
+    """Unix time of the most recent change covered by an account version."""
+    return max(version_timestamp(part) for part in version.split("."))
+
+
+def invalidate_account(user_id):
+    bump_version(account_version_key(user_id))
+
+
+def invalidate_all_accounts():
+    bump_version(ACCOUNT_EPOCH_KEY)
@@ -0,0 +1,80 @@
+import time
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+from core.db_router import replica_reads
+from .caching import account_last_modified, account_version
+
+
+def conditional_account_get(view_method):
+    """
+    Wrap a GET handler whose response depends only on the requesting user's
+    account data (lays, weekly bonuses, balance).
+
+    The user's account version is bumped on every write to that data and
+    lives in the shared cache. That makes it a free validator: unchanged
+    clients get a 304 from If-None-Match / If-Modified-Since before the
+    handler, and so any query or serializer, runs. The version is passed to
+    the handler as `account_version` so it can key its own caches on it.
+
+    Last-Modified has whole-second resolution, so it is only sent (and
+    If-Modified-Since only honoured) once the second of the last change is
+    over; a later change in that same second would otherwise keep the date.
+
+    The version also tells when the data last changed, so the handler reads
+    from the replica unless that was too recent for it to have caught up.
+
+    Works on both sync handlers and the async ones in accounts.async_views.
+    """
+    if iscoroutinefunction(view_method):
+        @wraps(view_method)
+        async def async_wrapper(self, request, *args, **kwargs):
+            version = await sync_to_async(account_version)(request.user.pk)
+            etag, changed_at = quote_etag(version), account_last_modified(version)
+            last_modified = _settled_second(changed_at)
+            response = get_conditional_response(
+                request, etag=etag, last_modified=last_modified)
+            if response is None:
+                request.account_version = version
+                with replica_reads(changed_at=changed_at):
+                    response = await view_method(self, request, *args, **kwargs)
+                if response.status_code != 200:
+                    return response
+            return _add_validators(response, etag, last_modified)
+
+        return async_wrapper
+
+    @wraps(view_method)
+    def wrapper(self, request, *args, **kwargs):
+        version = account_version(request.user.pk)
+        etag, changed_at = quote_etag(version), account_last_modified(version)
+        last_modified = _settled_second(changed_at)
+        response = get_conditional_response(
+            request, etag=etag, last_modified=last_modified)
+        if response is None:
+            request.account_version = version
+            with replica_reads(changed_at=changed_at):
+                response = view_method(self, request, *args, **kwargs)
+            if response.status_code != 200:
+                return response
+        return _add_validators(response, etag, last_modified)
+
+    return wrapper
+
+
+def _settled_second(changed_at):
+    """The whole second of `changed_at`, or None while that second is not over."""
+    second = int(changed_at)
+    return second if second < int(time.time()) else None
+
+
+def _add_validators(response, etag, last_modified):
+    response.headers.setdefault("ETag", etag)
+    if last_modified is not None:
+        response.headers.setdefault("Last-Modified", http_date(last_modified))
+    # Always revalidate: a version bump must be visible on the next poll
+    response.headers.setdefault("Cache-Control", "private, no-cache")
+    return response
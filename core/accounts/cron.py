@@ -1,32 +1,26 @@
-from decimal import Decimal
-from django.utils.timezone import now
-from .models import WeeklyBonus
-from .utils import get_week_range  # the helper we wrote before
+import logging
+
+from core.money import from_micros
+
+from .settlement import settle_weekly_bonuses
+
+
+logger = logging.getLogger(__name__)
 
 
 def reset_weekly_bonuses():
     """Called every Monday 00:01 via django-crontab."""
-    today = now().date()
-    start, end = get_week_range(today)
-    new_start = start
-    new_end = end
-
-    # Iterate through all users’ bonuses
-    for bonus in WeeklyBonus.objects.all():
-        user = bonus.user
-        # Apply reward to user’s wallet if you store it on user
-        if bonus.weekly_reward and bonus.weekly_reward > 0:
-            # convert float -> Decimal safely, then add
-            # user.balance is FloatField
-            current = Decimal(str(user.balance or 0))
-            new_balance = (current + Decimal(bonus.weekly_reward))
-            # keep the field type consistent
-            user.balance = float(new_balance)
-            user.save(update_fields=["balance"])
-
-        # reset the weekly counters (if that's your desired behavior here)
-        bonus.weekly_balance = Decimal("0")
-        bonus.weekly_reward = Decimal("0")
-        bonus.save(update_fields=["weekly_balance", "weekly_reward"])
-
-    print(f"✅ Weekly bonuses reset on {today}")
+    result = settle_weekly_bonuses()
+
+    if result.already_settled:
+        logger.info("Weekly bonuses for week of %s already settled, skipping",
+                    result.week_start)
+        return result
+
+    logger.info(
+        "Weekly bonuses settled for week of %s: %s bonuses reset, %s users "
+        "credited %s in %sms",
+        result.week_start, result.bonuses_reset, result.users_credited,
+        from_micros(result.total_credited), result.duration_ms,
+    )
+    return result
@@ -0,0 +1,69 @@
+from django.db import connection
+from django.utils.timezone import now
+
+from core.metrics import DEPOSIT_ADDRESSES_SERVED
+from .caching import bump_version, get_version
+from .models import DepositAddress, DepositRotation
+
+POOL_VERSION_CACHE_KEY = "accounts:deposit_pool_version"
+
+# Per-worker copy of the pool: (version, addresses ordered by index).
+# Replaced as a whole tuple, so threads never see a half-built pool.
+_pool = (None, ())
+
+
+def deposit_pool():
+    """
+    Deposit addresses ordered by index, held in process memory.
+
+    Each call costs one shared-cache read of the pool version; the table is
+    only read again after a DepositAddress change bumps that version.
+    """
+    global _pool
+    version = get_version(POOL_VERSION_CACHE_KEY)
+    cached_version, addresses = _pool
+    if cached_version != version:
+        addresses = tuple(
+            DepositAddress.objects.order_by("index")
+            .values_list("address", flat=True)
+        )
+        _pool = (version, addresses)
+    return addresses
+
+
+def invalidate_deposit_pool():
+    bump_version(POOL_VERSION_CACHE_KEY)
+
+
+def advance_rotation(pool_size):
+    """
+    Atomically step the rotation and return the 1-based position that was
+    current before the step.
+
+    A single `UPDATE ... RETURNING` with modulo arithmetic replaces the old
+    SELECT FOR UPDATE / read max(index) / save sequence, so concurrent
+    requests never wait on a lock held across several round-trips.
+    """
+    table = connection.ops.quote_name(DepositRotation._meta.db_table)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"UPDATE {table} SET current_index = current_index %% %s + 1, "
+            f"last_updated = %s "
+            f"WHERE id = (SELECT MIN(id) FROM {table}) "
+            f"RETURNING current_index",
+            [pool_size, now()],
+        )
+        row = cursor.fetchone()
+    if row is None:
+        raise DepositRotation.DoesNotExist("Deposit rotation is not initialized")
+    # new = old % n + 1, so the position we hand out is the one before it
+    return (row[0] - 2) % pool_size + 1
+
+
+def next_deposit_address():
+    pool = deposit_pool()
+    if not pool:
+        raise DepositAddress.DoesNotExist("No deposit addresses configured")
+    address = pool[advance_rotation(len(pool)) - 1]
+    DEPOSIT_ADDRESSES_SERVED.inc()
+    return address
@@ -0,0 +1,207 @@
+"""
+Push channel behind the account event stream (async_views.AccountEventsView).
+
+Writers publish compact deltas for one user, or for everyone:
+
+    lay          {"id": "...", "status": "approved"}  a lay was created or settled
+    balance      {"balance": 12.5}                     the wallet balance changed
+    settlement   {}                                    weekly rewards were credited (everyone)
+    resync       {}                                    events may have been lost
+
+A client refetches AccountInfoView when it needs more than the delta, and on
+`resync`.
+
+Events are sent when the writer's transaction commits, so nothing is pushed
+for rolled back changes and no query is added while its row locks are held.
+On PostgreSQL they go out with one `pg_notify` per publish call and reach
+every worker: each ASGI worker LISTENs on one extra connection and fans the
+events out to its open streams through `hub`. Other databases have no
+channel between processes, so events go straight to this process's hub,
+which is enough for development and tests.
+"""
+import asyncio
+import json
+import logging
+from collections import defaultdict
+from functools import partial
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import connection, connections, transaction
+from django.utils.http import quote_etag
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "account_events"
+EVERYONE = "*"
+LISTEN_RETRY_SECONDS = 5
+
+
+def _json(data):
+    return json.dumps(data, separators=(",", ":"))
+
+
+def _payload(user_id, event, data):
+    return f"{user_id} {event} {_json(data or {})}"
+
+
+def publish(user_id, event, data=None):
+    publish_many([(user_id, event, data)])
+
+
+def publish_many(events):
+    """Publish (user_id, event, data) triples; user_id may be EVERYONE."""
+    if not settings.ACCOUNT_EVENTS_ENABLED or not events:
+        return
+    payloads = [_payload(*event) for event in events]
+    if connection.vendor == "postgresql":
+        send = partial(_notify, payloads)
+    else:
+        send = partial(hub.dispatch, payloads)
+    # robust: a lost event must not fail a request whose data is committed
+    transaction.on_commit(send, robust=True)
+
+
+def _notify(payloads):
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT pg_notify(%s, payload) FROM unnest(%s::text[]) AS payload",
+            [CHANNEL, payloads],
+        )
+
+
+class AccountEventHub:
+    """
+    Open event streams of this process, by user. Streams subscribe on the
+    event loop; `dispatch` may be called from any thread.
+    """
+
+    def __init__(self):
+        self._streams = defaultdict(set)
+        self._loop = None
+        self._listener = None
+
+    def subscribe(self, user_id):
+        self._loop = asyncio.get_running_loop()
+        if self._listener is None and connection.vendor == "postgresql":
+            self._listener = self._loop.create_task(self._listen())
+        queue = asyncio.Queue(maxsize=settings.ACCOUNT_EVENTS_QUEUE_SIZE)
+        self._streams[str(user_id)].add(queue)
+        return queue
+
+    def unsubscribe(self, user_id, queue):
+        streams = self._streams.get(str(user_id))
+        if streams is not None:
+            streams.discard(queue)
+            if not streams:
+                del self._streams[str(user_id)]
+
+    def dispatch(self, payloads):
+        loop = self._loop
+        if loop is None:
+            return
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            self._deliver(payloads)
+            return
+        try:
+            loop.call_soon_threadsafe(self._deliver, payloads)
+        except RuntimeError:
+            pass  # The loop has shut down, and its streams with it
+
+    def _deliver(self, payloads):
+        for payload in payloads:
+            user_id, event, data = payload.split(" ", 2)
+            if user_id == EVERYONE:
+                queues = [q for streams in self._streams.values() for q in streams]
+            else:
+                queues = self._streams.get(user_id, ())
+            for queue in queues:
+                self._put(queue, event, data)
+
+    @staticmethod
+    def _put(queue, event, data):
+        try:
+            queue.put_nowait((event, data))
+        except asyncio.QueueFull:
+            # The client is not keeping up; drop its backlog and have it refetch
+            while not queue.empty():
+                queue.get_nowait()
+            queue.put_nowait(("resync", "{}"))
+
+    async def _listen(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            try:
+                listener = await sync_to_async(
+                    _listen_connection, thread_sensitive=False)()
+            except Exception:
+                logger.exception("Could not LISTEN for account events")
+                await asyncio.sleep(LISTEN_RETRY_SECONDS)
+                continue
+
+            fd = listener.fileno()
+            readable = asyncio.Event()
+            loop.add_reader(fd, readable.set)
+            # Anything sent while we were not listening is lost
+            self._deliver([_payload(EVERYONE, "resync", None)])
+            try:
+                while True:
+                    await readable.wait()
+                    readable.clear()
+                    listener.poll()
+                    payloads = [notify.payload for notify in listener.notifies]
+                    listener.notifies.clear()
+                    self._deliver(payloads)
+            except Exception:
+                logger.exception("Lost the account events connection")
+            finally:
+                loop.remove_reader(fd)
+                listener.close()
+            await asyncio.sleep(LISTEN_RETRY_SECONDS)
+
+
+def _listen_connection():
+    db = connections["default"]
+    listener = db.Database.connect(**db.get_connection_params())
+    listener.autocommit = True
+    with listener.cursor() as cursor:
+        cursor.execute(f"LISTEN {CHANNEL}")
+    return listener
+
+
+hub = AccountEventHub()
+
+
+def _message(event, data):
+    return f"event: {event}\ndata: {data}\n\n"
+
+
+async def account_event_stream(user_id, version):
+    """
+    Server-sent events for `user_id`. The first event carries the ETag of
+    the current account version, so a reconnecting client can tell whether
+    it missed anything. Ends after ACCOUNT_EVENTS_STREAM_SECONDS; the client
+    reconnects, re-authenticating with its current token.
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + settings.ACCOUNT_EVENTS_STREAM_SECONDS
+    queue = hub.subscribe(user_id)
+    try:
+        yield f"retry: {settings.ACCOUNT_EVENTS_RETRY_MS}\n" + _message(
+            "version", _json({"etag": quote_etag(version)}))
+        while (remaining := deadline - loop.time()) > 0:
+            try:
+                event, data = await asyncio.wait_for(
+                    queue.get(),
+                    min(settings.ACCOUNT_EVENTS_HEARTBEAT_SECONDS, remaining))
+            except asyncio.TimeoutError:
+                # Keeps proxies from closing an idle stream
+                yield ": keepalive\n\n"
+                continue
+            yield _message(event, data)
+    finally:
+        hub.unsubscribe(user_id, queue)
@@ -0,0 +1,42 @@
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from PIL import Image, ImageOps
+
+
+def _flatten(image):
+    """JPEG has no alpha: composite transparent screenshots onto white."""
+    if image.mode in ("RGBA", "LA", "P"):
+        image = image.convert("RGBA")
+        background = Image.new("RGB", image.size, (255, 255, 255))
+        background.paste(image, mask=image.getchannel("A"))
+        return background
+    return image.convert("RGB")
+
+
+def _encode(image, max_dimension, quality):
+    variant = image.copy()
+    variant.thumbnail((max_dimension, max_dimension), Image.LANCZOS)
+    buffer = BytesIO()
+    # No exif/icc passed to save(), so all metadata is dropped
+    variant.save(buffer, format="JPEG", quality=quality, optimize=True)
+    return ContentFile(buffer.getvalue())
+
+
+def normalize_lay_image(fh):
+    """
+    Re-encode an uploaded screenshot to bounded-size JPEGs.
+
+    Returns a dict of ContentFiles keyed by variant: "file" (the stored
+    original, at most LAY_IMAGE_MAX_DIMENSION), "preview" and "thumbnail".
+    """
+    with Image.open(fh) as image:
+        image = _flatten(ImageOps.exif_transpose(image))
+
+    quality = settings.LAY_IMAGE_QUALITY
+    return {
+        "file": _encode(image, settings.LAY_IMAGE_MAX_DIMENSION, quality),
+        "preview": _encode(image, settings.LAY_IMAGE_PREVIEW_DIMENSION, quality),
+        "thumbnail": _encode(image, settings.LAY_IMAGE_THUMBNAIL_DIMENSION, quality),
+    }
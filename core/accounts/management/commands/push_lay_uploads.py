@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+from accounts.uploads import push_pending_uploads
+
+
+class Command(BaseCommand):
+    help = "Push lay screenshots left on the local upload spool to storage (run on the host that owns the spool)"
+
+    def handle(self, *args, **kwargs):
+        pushed, failed = push_pending_uploads()
+        self.stdout.write(self.style.SUCCESS(f"✅ Pushed {pushed} spooled uploads, {failed} failed."))
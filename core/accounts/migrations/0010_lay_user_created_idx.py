@@ -0,0 +1,21 @@
+# Generated by Django 5.2.1 on 2026-10-18 18:06
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0009_weeklybonus"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="lay",
+            index=models.Index(
+                fields=["user", "-created_at"], name="lay_user_created_idx"
+            ),
+        ),
+    ]
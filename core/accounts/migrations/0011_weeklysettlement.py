@@ -0,0 +1,36 @@
+# Generated by Django 5.2.1 on 2026-10-18 18:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0010_lay_user_created_idx"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="WeeklySettlement",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("week_start", models.DateField(unique=True)),
+                ("bonuses_reset", models.PositiveIntegerField(default=0)),
+                ("users_credited", models.PositiveIntegerField(default=0)),
+                (
+                    "total_credited",
+                    models.DecimalField(decimal_places=6, default=0, max_digits=14),
+                ),
+                ("duration_ms", models.PositiveIntegerField(default=0)),
+                ("settled_at", models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+    ]
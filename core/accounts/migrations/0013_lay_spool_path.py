@@ -0,0 +1,23 @@
+# Generated by Django 5.2.1 on 2026-10-18 18:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0012_weeklyledgerentry"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="lay",
+            name="spool_path",
+            field=models.CharField(blank=True, default="", max_length=500),
+        ),
+        migrations.AlterField(
+            model_name="lay",
+            name="file",
+            field=models.ImageField(blank=True, upload_to="lays/"),
+        ),
+    ]
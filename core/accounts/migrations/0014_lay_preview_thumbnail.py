@@ -0,0 +1,23 @@
+# Generated by Django 5.2.1 on 2026-10-18 18:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0013_lay_spool_path"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="lay",
+            name="preview",
+            field=models.ImageField(blank=True, upload_to="lays/"),
+        ),
+        migrations.AddField(
+            model_name="lay",
+            name="thumbnail",
+            field=models.ImageField(blank=True, upload_to="lays/"),
+        ),
+    ]
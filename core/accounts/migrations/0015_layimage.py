@@ -0,0 +1,44 @@
+# Generated by Django 5.2.1 on 2026-10-18 18:18
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0014_lay_preview_thumbnail"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="LayImage",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("sha256", models.CharField(max_length=64, unique=True)),
+                ("file", models.ImageField(upload_to="lays/")),
+                ("preview", models.ImageField(blank=True, upload_to="lays/")),
+                ("thumbnail", models.ImageField(blank=True, upload_to="lays/")),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name="lay",
+            name="image",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="lays",
+                to="accounts.layimage",
+            ),
+        ),
+    ]
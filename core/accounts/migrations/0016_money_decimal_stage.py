@@ -0,0 +1,53 @@
+# Generated by Django 5.2.1 on 2026-10-18 19:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    """
+    First step of the move to integer micro-units: widen every float and
+    decimal money column to numeric(20, 6) so the x1_000_000 scaling in the
+    next migration happens in exact decimal arithmetic.
+    """
+
+    dependencies = [
+        ("accounts", "0015_layimage"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="lay",
+            name="stake_amount",
+            field=models.DecimalField(decimal_places=6, max_digits=20),
+        ),
+        migrations.AlterField(
+            model_name="lay",
+            name="win_payout",
+            field=models.DecimalField(decimal_places=6, max_digits=20),
+        ),
+        migrations.AlterField(
+            model_name="withdrawrequest",
+            name="amount",
+            field=models.DecimalField(decimal_places=6, max_digits=20),
+        ),
+        migrations.AlterField(
+            model_name="weeklybonus",
+            name="weekly_balance",
+            field=models.DecimalField(decimal_places=6, default=0, max_digits=20),
+        ),
+        migrations.AlterField(
+            model_name="weeklybonus",
+            name="weekly_reward",
+            field=models.DecimalField(decimal_places=6, default=0, max_digits=20),
+        ),
+        migrations.AlterField(
+            model_name="weeklysettlement",
+            name="total_credited",
+            field=models.DecimalField(decimal_places=6, default=0, max_digits=20),
+        ),
+        migrations.AlterField(
+            model_name="weeklyledgerentry",
+            name="delta",
+            field=models.DecimalField(decimal_places=6, max_digits=20),
+        ),
+    ]
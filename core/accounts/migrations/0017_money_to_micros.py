@@ -0,0 +1,72 @@
+from decimal import Decimal, InvalidOperation
+
+from django.db import migrations
+from django.db.models import F, Value
+from django.db.models.functions import Round
+
+MICROS = 1_000_000
+
+SCALED_FIELDS = {
+    "Lay": ["stake_amount", "win_payout"],
+    "WithdrawRequest": ["amount"],
+    "WeeklyBonus": ["weekly_balance", "weekly_reward"],
+    "WeeklySettlement": ["total_credited"],
+    "WeeklyLedgerEntry": ["delta"],
+}
+
+
+def _loss_payout_micros(value):
+    try:
+        amount = Decimal((value or "0").strip())
+    except InvalidOperation:
+        return "0"
+    if not amount.is_finite():
+        return "0"
+    return str(int((amount * MICROS).to_integral_value()))
+
+
+def _loss_payout_units(value):
+    try:
+        return str(Decimal(int(value or 0)) / MICROS)
+    except ValueError:
+        return "0"
+
+
+def _rewrite_loss_payout(apps, convert):
+    Lay = apps.get_model("accounts", "Lay")
+    batch = []
+    for lay in Lay.objects.only("pk", "loss_payout").iterator(chunk_size=2000):
+        lay.loss_payout = convert(lay.loss_payout)
+        batch.append(lay)
+        if len(batch) == 2000:
+            Lay.objects.bulk_update(batch, ["loss_payout"])
+            batch = []
+    Lay.objects.bulk_update(batch, ["loss_payout"])
+
+
+def to_micros(apps, schema_editor):
+    for model_name, fields in SCALED_FIELDS.items():
+        model = apps.get_model("accounts", model_name)
+        model.objects.update(**{name: Round(F(name) * MICROS) for name in fields})
+    # loss_payout was free text; blank or unparseable values become 0
+    _rewrite_loss_payout(apps, _loss_payout_micros)
+
+
+def from_micros(apps, schema_editor):
+    for model_name, fields in SCALED_FIELDS.items():
+        model = apps.get_model("accounts", model_name)
+        model.objects.update(
+            **{name: F(name) / Value(float(MICROS)) for name in fields}
+        )
+    _rewrite_loss_payout(apps, _loss_payout_units)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0016_money_decimal_stage"),
+    ]
+
+    operations = [
+        migrations.RunPython(to_micros, from_micros),
+    ]
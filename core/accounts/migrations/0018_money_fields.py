@@ -0,0 +1,54 @@
+# Generated by Django 5.2.1 on 2026-10-18 19:02
+
+import core.money
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0017_money_to_micros"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="lay",
+            name="stake_amount",
+            field=core.money.MoneyField(),
+        ),
+        migrations.AlterField(
+            model_name="lay",
+            name="win_payout",
+            field=core.money.MoneyField(),
+        ),
+        migrations.AlterField(
+            model_name="lay",
+            name="loss_payout",
+            field=core.money.MoneyField(default=0),
+        ),
+        migrations.AlterField(
+            model_name="withdrawrequest",
+            name="amount",
+            field=core.money.MoneyField(),
+        ),
+        migrations.AlterField(
+            model_name="weeklybonus",
+            name="weekly_balance",
+            field=core.money.MoneyField(default=0),
+        ),
+        migrations.AlterField(
+            model_name="weeklybonus",
+            name="weekly_reward",
+            field=core.money.MoneyField(default=0),
+        ),
+        migrations.AlterField(
+            model_name="weeklysettlement",
+            name="total_credited",
+            field=core.money.MoneyField(default=0),
+        ),
+        migrations.AlterField(
+            model_name="weeklyledgerentry",
+            name="delta",
+            field=core.money.MoneyField(),
+        ),
+    ]
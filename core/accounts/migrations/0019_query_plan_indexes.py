@@ -0,0 +1,57 @@
+# Generated by Django 5.2.1 on 2026-10-18 18:27
+
+import django.db.models.functions.text
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0018_money_fields"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="lay",
+            index=models.Index(fields=["-created_at"], name="lay_created_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="lay",
+            index=models.Index(
+                condition=models.Q(("status", "pending")),
+                fields=["-created_at"],
+                name="lay_pending_created_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="lay",
+            index=models.Index(
+                condition=models.Q(("spool_path", ""), _negated=True),
+                fields=["id"],
+                name="lay_spool_pending_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="weeklybonus",
+            index=models.Index(
+                condition=models.Q(
+                    ("weekly_balance", 0), ("weekly_reward", 0), _negated=True
+                ),
+                fields=["id"],
+                name="weekly_bonus_open_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="withdrawrequest",
+            index=models.Index(fields=["-created_at"], name="withdraw_created_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="withdrawrequest",
+            index=models.Index(
+                django.db.models.functions.text.Upper("address"),
+                name="withdraw_address_upper_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 5.2.1 on 2026-10-18 18:59
+
+from django.conf import settings
+from django.db import migrations, models
+
+INDEX = "lay_file_name_trgm_idx"
+
+
+def create_trigram_index(apps, schema_editor):
+    # Trigram indexes are PostgreSQL only; elsewhere search scans the table
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    table = apps.get_model("accounts", "Lay")._meta.db_table
+    schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    # Matches the UPPER(...) LIKE that icontains compiles to
+    schema_editor.execute(
+        f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {INDEX} "
+        f"ON {schema_editor.quote_name(table)} USING gin (UPPER(file_name) gin_trgm_ops)"
+    )
+
+
+def drop_trigram_index(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {INDEX}")
+
+
+class Migration(migrations.Migration):
+    """
+    Indexes for the admin changelists: week_start ordering and drill-down
+    on weekly bonuses, and a trigram index for the lay file name search
+    (built concurrently, outside a transaction).
+    """
+    atomic = False
+
+    dependencies = [
+        ("accounts", "0019_query_plan_indexes"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="weeklybonus",
+            index=models.Index(fields=["-week_start"], name="weekly_bonus_week_idx"),
+        ),
+        migrations.RunPython(create_trigram_index, drop_trigram_index),
+    ]
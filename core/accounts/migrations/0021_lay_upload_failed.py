@@ -0,0 +1,18 @@
+# Generated by Django 5.2.1 on 2026-10-18 20:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0020_admin_changelist_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="lay",
+            name="upload_failed",
+            field=models.BooleanField(default=False),
+        ),
+    ]
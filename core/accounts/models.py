@@ -1,7 +1,12 @@
 import uuid
-from decimal import Decimal
 from django.db import models,  transaction
+from django.db.models import Q, Sum
+from django.db.models.functions import Upper
 from authentication.models import CustomUser as User
+from core.metrics import LAYS_CREATED, LAYS_SETTLED
+from core.money import MoneyField
+from . import wallet
+from .events import publish
 from .utils import apply_weekly_delta
 
 
@@ -11,20 +16,44 @@ class LayStatus(models.TextChoices):
     APPROVED = "approved", "Approved"
 
 
+class LayImage(models.Model):
+    """
+    Content-addressed lay screenshot. Identical uploads (same SHA-256 of the
+    original bytes) share one row and one set of stored objects.
+    """
+    sha256 = models.CharField(max_length=64, unique=True)
+    file = models.ImageField(upload_to='lays/')
+    preview = models.ImageField(upload_to='lays/', blank=True)
+    thumbnail = models.ImageField(upload_to='lays/', blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return self.sha256
+
+
 class Lay(models.Model):
 
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     user = models.ForeignKey(
         User, on_delete=models.CASCADE, related_name='lays')
     total_odds = models.FloatField()
-    stake_amount = models.FloatField()
-    win_payout = models.FloatField()
+    stake_amount = MoneyField()
+    win_payout = MoneyField()
     file_name = models.CharField(max_length=255)
-    file = models.ImageField(upload_to='lays/')
+    file = models.ImageField(upload_to='lays/', blank=True)
+    preview = models.ImageField(upload_to='lays/', blank=True)
+    thumbnail = models.ImageField(upload_to='lays/', blank=True)
+    image = models.ForeignKey(
+        LayImage, on_delete=models.SET_NULL, null=True, blank=True,
+        related_name='lays')
+    # Local spool copy while the upload to storage is still pending
+    spool_path = models.CharField(max_length=500, blank=True, default="")
+    # The spool copy was lost before it reached storage
+    upload_failed = models.BooleanField(default=False)
 
     match = models.CharField(max_length=255, default="")
     tip = models.CharField(max_length=255, default="")
-    loss_payout = models.CharField(max_length=255, default="")
+    loss_payout = MoneyField(default=0)
     created_at = models.DateTimeField(auto_now_add=True)
     status = models.CharField(
         max_length=20,
@@ -32,63 +61,93 @@ class Lay(models.Model):
         default=LayStatus.PENDING,
     )
 
-    def _status_weekly_delta(self, status) -> Decimal:
+    class Meta:
+        indexes = [
+            models.Index(fields=["user", "-created_at"],
+                         name="lay_user_created_idx"),
+            # Admin changelist ordering and date filter
+            models.Index(fields=["-created_at"], name="lay_created_idx"),
+            # Review queue: only the (few) pending lays are indexed
+            models.Index(fields=["-created_at"], name="lay_pending_created_idx",
+                         condition=Q(status="pending")),
+            # Lays whose screenshot still waits for the push to storage
+            models.Index(fields=["id"], name="lay_spool_pending_idx",
+                         condition=~Q(spool_path="")),
+        ]
+
+    def _status_weekly_delta(self, status) -> int:
         if status == "approved":
-            return Decimal(str(self.win_payout)) - Decimal(str(self.stake_amount))
+            return self.win_payout - self.stake_amount
         if status == "declined":
-            return -Decimal(str(self.stake_amount))
-        return Decimal("0")
+            return -self.stake_amount
+        return 0
 
     # ── Wallet (available balance) credit on a given status
     # Declined: +loss_payout
     # Approved: +win_payout
-    def _status_wallet_credit(self, status) -> Decimal:
+    def _status_wallet_credit(self, status) -> int:
         if status == "approved":
-            return Decimal(str(self.win_payout))
+            return self.win_payout
         if status == "declined":
-            return Decimal(str(self.loss_payout or "0"))
-        return Decimal("0")
+            return self.loss_payout
+        return 0
 
-    def save(self, *args, **kwargs):
-        old_status = None
-        if self.pk:
-            try:
-                old_status = Lay.objects.only("status").get(pk=self.pk).status
-            except Lay.DoesNotExist:
-                old_status = None
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the persisted status so save() can diff without a re-read
+        if "status" in field_names:
+            instance._loaded_status = values[field_names.index("status")]
+        return instance
+
+    def _previous_status(self):
+        if self._state.adding:
+            return None
+        if hasattr(self, "_loaded_status"):
+            return self._loaded_status
+        return (
+            Lay.objects.filter(pk=self.pk)
+            .values_list("status", flat=True)
+            .first()
+        )
 
-        with transaction.atomic():
-            # lock the user row to make wallet math race-safe
-            user = User.objects.select_for_update().get(pk=self.user_id)
+    def save(self, *args, **kwargs):
+        adding = self._state.adding
+        old_status = self._previous_status()
 
+        with transaction.atomic(savepoint=False):
             super().save(*args, **kwargs)  # persist changes to this Lay
 
             # Only act when status actually changed
             if old_status != self.status:
-                ref_date = self.created_at.date() if self.created_at else None
-
-                # 1) WEEKLY BALANCE change: revert old effect, apply new
-                if old_status:
-                    apply_weekly_delta(
-                        user=self.user,
-                        reference_date=ref_date,
-                        delta=-self._status_weekly_delta(old_status),
-                    )
-                apply_weekly_delta(
-                    user=self.user,
-                    reference_date=ref_date,
-                    delta=self._status_weekly_delta(self.status),
-                )
-
-                # 2) USER WALLET (available balance): credit difference
-                old_credit = self._status_wallet_credit(
-                    old_status) if old_status else Decimal("0")
-                new_credit = self._status_wallet_credit(self.status)
-                diff = new_credit - old_credit
-
-                current = Decimal(str(user.balance or 0))
-                user.balance = float(current + diff)
-                user.save(update_fields=["balance"])
+                self._apply_status_change(old_status)
+                publish(self.user_id, "lay",
+                        {"id": str(self.pk), "status": self.status})
+                counter = LAYS_CREATED if adding else LAYS_SETTLED
+                transaction.on_commit(counter.labels(status=self.status).inc)
+
+        self._loaded_status = self.status
+
+    def _apply_status_change(self, old_status):
+        """
+        Move the weekly balance and the wallet from the effect of
+        `old_status` to the effect of the current status. Both are in-place
+        F() increments, so no row lock is taken on the user or the bonus.
+        """
+        old_delta = self._status_weekly_delta(
+            old_status) if old_status else 0
+        apply_weekly_delta(
+            user=self.user_id,
+            reference_date=self.created_at.date(),
+            delta=self._status_weekly_delta(self.status) - old_delta,
+            lay=self,
+        )
+
+        old_credit = self._status_wallet_credit(
+            old_status) if old_status else 0
+        diff = self._status_wallet_credit(self.status) - old_credit
+        if diff:
+            wallet.adjust(self.user_id, diff)
 
 
 class DepositAddress(models.Model):
@@ -107,10 +166,17 @@ class DepositRotation(models.Model):
 class WithdrawRequest(models.Model):
     user = models.ForeignKey(
         User, on_delete=models.CASCADE, related_name="withdraw_requests")
-    amount = models.FloatField()
+    amount = MoneyField()
     address = models.CharField(max_length=255)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["-created_at"], name="withdraw_created_idx"),
+            # Serves the admin's case-insensitive exact address search
+            models.Index(Upper("address"), name="withdraw_address_upper_idx"),
+        ]
+
 
 class WeeklyBonus(models.Model):
     user = models.ForeignKey(
@@ -118,23 +184,29 @@ class WeeklyBonus(models.Model):
     week_start = models.DateField()
     week_end = models.DateField()
 
-    weekly_balance = models.DecimalField(
-        max_digits=12, decimal_places=6, default=0)
-    weekly_reward = models.DecimalField(
-        max_digits=12, decimal_places=6, default=0)
+    weekly_balance = MoneyField(default=0)
+    weekly_reward = MoneyField(default=0)
 
     created_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
+        # The unique index also serves per-user lookups ordered by week_start
         unique_together = ("user", "week_start", "week_end")
+        indexes = [
+            # Admin changelist ordering and date drill-down
+            models.Index(fields=["-week_start"], name="weekly_bonus_week_idx"),
+            # Rows the weekly settlement still has to credit or reset
+            models.Index(fields=["id"], name="weekly_bonus_open_idx",
+                         condition=~Q(weekly_balance=0, weekly_reward=0)),
+        ]
 
     def calculate_reward(self):
-        # Use Decimal arithmetic
-        bal = Decimal(self.weekly_balance)
+        # Integer micros; the 20% is rounded down to the micro
+        bal = self.weekly_balance
         if bal < 0:
-            self.weekly_reward = (-bal) / Decimal("5")  # 20%
+            self.weekly_reward = (-bal) // 5  # 20%
         else:
-            self.weekly_reward = Decimal("0")
+            self.weekly_reward = 0
         return self.weekly_reward
 
     def reset_week(self, new_start, new_end):
@@ -150,3 +222,56 @@ class WeeklyBonus(models.Model):
 
     def __str__(self):
         return f'{self.user}: {self.week_start} - {self.week_end}'
+
+
+class WeeklySettlement(models.Model):
+    """
+    One row per settled week. Its presence is what makes the Monday
+    settlement idempotent: a rerun for the same week is a no-op.
+    """
+    week_start = models.DateField(unique=True)
+    bonuses_reset = models.PositiveIntegerField(default=0)
+    users_credited = models.PositiveIntegerField(default=0)
+    total_credited = MoneyField(default=0)
+    duration_ms = models.PositiveIntegerField(default=0)
+    settled_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f'Settlement for week of {self.week_start}'
+
+
+class WeeklyLedgerQuerySet(models.QuerySet):
+    def weekly_totals(self):
+        """Net P&L per (user, week), aggregated from the entries."""
+        return (
+            self.values("user", "week_start")
+            .annotate(total=Sum("delta"))
+            .order_by("user", "week_start")
+        )
+
+
+class WeeklyLedgerEntry(models.Model):
+    """
+    Append-only record of every weekly-balance movement. `WeeklyBonus`
+    holds the running (and weekly reset) balance; the entries keep the full
+    per-week history for audits and reconciliation.
+    """
+    user = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name="weekly_ledger_entries")
+    lay = models.ForeignKey(
+        Lay, on_delete=models.SET_NULL, null=True, blank=True,
+        related_name="weekly_ledger_entries")
+    week_start = models.DateField()
+    delta = MoneyField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    objects = WeeklyLedgerQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["user", "week_start"],
+                         name="ledger_user_week_idx"),
+        ]
+
+    def __str__(self):
+        return f'{self.user_id} {self.week_start}: {self.delta}'
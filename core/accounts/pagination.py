@@ -0,0 +1,83 @@
+import base64
+import json
+import uuid
+
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+
+
+class LayCursorPagination(BasePagination):
+    """
+    Keyset pagination over (created_at, id), newest first.
+
+    The cursor is an opaque token holding the position of the last lay on the
+    previous page, so every page is a single index range scan on
+    (user, -created_at) no matter how deep into the history the client is.
+    """
+    page_size = api_settings.PAGE_SIZE or 10
+    max_page_size = 100
+    cursor_query_param = "cursor"
+    page_size_query_param = "page_size"
+    ordering = ("-created_at", "-id")
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return max(1, min(size, self.max_page_size))
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        page_size = self.get_page_size(request)
+        position = self.decode_cursor(
+            request.query_params.get(self.cursor_query_param))
+        return self.paginate_after(queryset, position, page_size)
+
+    def paginate_after(self, queryset, position=None, page_size=None):
+        """Return the page that follows `position` and remember the next cursor."""
+        page_size = page_size or self.page_size
+        queryset = queryset.order_by(*self.ordering)
+        if position is not None:
+            created_at, pk = position
+            queryset = queryset.filter(
+                Q(created_at__lt=created_at) |
+                Q(created_at=created_at, id__lt=pk)
+            )
+
+        # Fetch one extra row to know whether another page exists
+        rows = list(queryset[:page_size + 1])
+        self.has_next = len(rows) > page_size
+        self.page = rows[:page_size]
+        self.next_cursor = (
+            self.encode_cursor(self.page[-1]) if self.has_next else None
+        )
+        return self.page
+
+    def encode_cursor(self, lay):
+        payload = json.dumps(
+            {"t": lay.created_at.isoformat(), "i": str(lay.id)})
+        return base64.urlsafe_b64encode(payload.encode()).decode()
+
+    def decode_cursor(self, cursor):
+        if not cursor:
+            return None
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+            created_at = parse_datetime(payload["t"])
+            pk = uuid.UUID(payload["i"])
+        except (TypeError, ValueError, KeyError):
+            raise NotFound("Invalid cursor") from None
+        if created_at is None:
+            raise NotFound("Invalid cursor")
+        return created_at, pk
+
+    def get_paginated_response(self, data):
+        return Response({
+            "next_cursor": self.next_cursor,
+            "results": data,
+        })
@@ -1,23 +1,28 @@
 from rest_framework import serializers
 from django.utils.translation import gettext_lazy as _
-from .models import Lay, WithdrawRequest, WeeklyBonus
+from core.money import MoneySerializerField
+from .models import Lay, LayStatus, WithdrawRequest, WeeklyBonus
 
 
 class LaySerializer(serializers.ModelSerializer):
+    stake_amount = MoneySerializerField()
+    win_payout = MoneySerializerField()
+    loss_payout = MoneySerializerField(as_string=True)
+
     class Meta:
         model = Lay
         fields = ['id', 'total_odds', 'stake_amount',
-                  'win_payout', 'loss_payout', 'file_name', 'tip', 'match', 'created_at', 'status']
+                  'win_payout', 'loss_payout', 'file_name', 'thumbnail', 'tip', 'match', 'created_at', 'status']
 
 
 class LayCreateSerializer(serializers.Serializer):
     total_odd = serializers.FloatField()
-    stake_amount = serializers.FloatField()
-    win_payout = serializers.FloatField()
+    stake_amount = MoneySerializerField()
+    win_payout = MoneySerializerField()
     file = serializers.ImageField()
     tip = serializers.CharField()
     match = serializers.CharField()
-    loss_payout = serializers.CharField()
+    loss_payout = MoneySerializerField()
 
     def validate(self, data):
         user = self.context['request'].user
@@ -33,7 +38,15 @@ class LayCreateSerializer(serializers.Serializer):
         return data
 
 
+class LaySettlementSerializer(serializers.Serializer):
+    ids = serializers.ListField(
+        child=serializers.UUIDField(), allow_empty=False, max_length=5000)
+    status = serializers.ChoiceField(choices=LayStatus.choices)
+
+
 class WithdrawRequestSerializer(serializers.ModelSerializer):
+    amount = MoneySerializerField()
+
     class Meta:
         model = WithdrawRequest
         fields = ['amount', 'address']
@@ -49,6 +62,9 @@ class WithdrawRequestSerializer(serializers.ModelSerializer):
 
 
 class WeeklyBonusSerializer(serializers.ModelSerializer):
+    weekly_balance = MoneySerializerField(as_string=True)
+    weekly_reward = MoneySerializerField(as_string=True)
+
     class Meta:
         model = WeeklyBonus
         fields = ["id", "week_start", "week_end",
@@ -0,0 +1,167 @@
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import date, timedelta
+
+from django.db import transaction
+from django.db.models import F, OuterRef, Subquery, Sum
+from django.utils.timezone import now
+
+from authentication.models import CustomUser as User
+from core.metrics import LAYS_SETTLED, SETTLEMENT_SECONDS
+from . import wallet
+from .caching import invalidate_account, invalidate_all_accounts
+from .events import EVERYONE, publish, publish_many
+from .models import Lay, WeeklyBonus, WeeklyLedgerEntry, WeeklySettlement
+from .utils import bump_weekly_bonus, get_week_range
+
+SETTLEMENT_CHUNK_SIZE = 1000
+
+
+@dataclass
+class WeeklySettlementResult:
+    week_start: date
+    already_settled: bool = False
+    bonuses_reset: int = 0
+    users_credited: int = 0
+    total_credited: int = 0
+    duration_ms: int = 0
+
+
+def settle_weekly_bonuses(today=None, chunk_size=SETTLEMENT_CHUNK_SIZE):
+    """
+    Credit every outstanding weekly reward to its user's wallet and zero the
+    weekly counters, for the week that ended before `today`.
+
+    Everything runs in one transaction with a handful of set-based UPDATEs per
+    chunk of bonus rows. The WeeklySettlement ledger row is created in the
+    same transaction, so a crash rolls back cleanly and a rerun for a week
+    that already settled does nothing.
+    """
+    started = time.monotonic()
+    current_start, _ = get_week_range(today or now().date())
+    week_start = current_start - timedelta(days=7)
+    result = WeeklySettlementResult(week_start=week_start)
+
+    with transaction.atomic():
+        ledger, created = WeeklySettlement.objects.get_or_create(
+            week_start=week_start)
+        if not created:
+            result.already_settled = True
+            return result
+
+        # Lock the rows being settled so a concurrent lay settlement can't
+        # move a balance between crediting and zeroing it. The current week
+        # is still open and settles next Monday, as its own week
+        bonus_ids = list(
+            WeeklyBonus.objects.select_for_update()
+            .filter(week_start__lte=week_start)
+            .exclude(weekly_balance=0, weekly_reward=0)
+            .order_by("pk")
+            .values_list("pk", flat=True)
+        )
+
+        for i in range(0, len(bonus_ids), chunk_size):
+            chunk = bonus_ids[i:i + chunk_size]
+            rewarded = WeeklyBonus.objects.filter(
+                pk__in=chunk, weekly_reward__gt=0)
+            per_user = (
+                rewarded.filter(user=OuterRef("pk"))
+                .values("user")
+                .annotate(total=Sum("weekly_reward"))
+                .values("total")
+            )
+            result.total_credited += (
+                rewarded.aggregate(total=Sum("weekly_reward"))["total"] or 0
+            )
+            result.users_credited += User.objects.filter(
+                pk__in=rewarded.values("user")
+            ).update(balance=F("balance") + Subquery(per_user))
+            result.bonuses_reset += WeeklyBonus.objects.filter(
+                pk__in=chunk
+            ).update(weekly_balance=0, weekly_reward=0)
+
+        result.duration_ms = int((time.monotonic() - started) * 1000)
+        ledger.bonuses_reset = result.bonuses_reset
+        ledger.users_credited = result.users_credited
+        ledger.total_credited = result.total_credited
+        ledger.duration_ms = result.duration_ms
+        ledger.save()
+        invalidate_all_accounts()
+        publish(EVERYONE, "settlement")
+
+    SETTLEMENT_SECONDS.labels(kind="weekly").observe(result.duration_ms / 1000)
+    return result
+
+
+@dataclass
+class LaySettlementResult:
+    settled: int = 0
+    users: int = 0
+
+
+def settle_lays(lays, status):
+    """
+    Move every lay in the `lays` queryset to `status` in one transaction.
+
+    This does the same bookkeeping as Lay.save, but in bulk. The wallet and
+    weekly deltas are summed in memory per user (and per user-week). Each
+    user then gets a single balance UPDATE, and each user-week a single
+    WeeklyBonus UPDATE. The lays themselves change status with one UPDATE.
+    """
+    started = time.monotonic()
+    result = LaySettlementResult()
+
+    with transaction.atomic():
+        to_settle = list(
+            lays.select_for_update()
+            .exclude(status=status)
+            .only("id", "user_id", "status", "stake_amount", "win_payout",
+                  "loss_payout", "created_at")
+        )
+        if not to_settle:
+            return result
+
+        wallet_deltas = defaultdict(int)
+        weekly = defaultdict(int)
+        entries = []
+        for lay in to_settle:
+            old_status = lay.status
+            week_start, week_end = get_week_range(lay.created_at.date())
+            delta = (lay._status_weekly_delta(status)
+                     - lay._status_weekly_delta(old_status))
+            if delta:
+                weekly[(lay.user_id, week_start, week_end)] += delta
+                entries.append(WeeklyLedgerEntry(
+                    user_id=lay.user_id, lay=lay, week_start=week_start,
+                    delta=delta))
+            wallet_deltas[lay.user_id] += (lay._status_wallet_credit(status)
+                                          - lay._status_wallet_credit(old_status))
+
+        Lay.objects.filter(pk__in=[lay.pk for lay in to_settle]).update(
+            status=status)
+        WeeklyLedgerEntry.objects.bulk_create(entries)
+
+        # Fixed order so concurrent settlements can't deadlock on users
+        for (user_id, week_start, week_end), delta in sorted(weekly.items()):
+            if delta:
+                bump_weekly_bonus(user_id, week_start, week_end, delta)
+        events = []
+        for user_id, diff in sorted(wallet_deltas.items()):
+            if diff:
+                balance = wallet.adjust(user_id, diff, notify=False)
+                events.append(
+                    (user_id, "balance", wallet.balance_event(balance)))
+            else:
+                invalidate_account(user_id)
+        events += [
+            (lay.user_id, "lay", {"id": str(lay.pk), "status": status})
+            for lay in to_settle
+        ]
+        publish_many(events)
+
+    result.settled = len(to_settle)
+    result.users = len(wallet_deltas)
+    LAYS_SETTLED.labels(status=status).inc(result.settled)
+    SETTLEMENT_SECONDS.labels(kind="lays").observe(time.monotonic() - started)
+    return result
@@ -0,0 +1,23 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from authentication.models import CustomUser
+from .caching import invalidate_account
+from .deposits import invalidate_deposit_pool
+from .models import DepositAddress, Lay, WeeklyBonus
+
+
+@receiver([post_save, post_delete], sender=DepositAddress)
+def deposit_address_changed(sender, **kwargs):
+    invalidate_deposit_pool()
+
+
+@receiver([post_save, post_delete], sender=CustomUser)
+def user_changed(sender, instance, **kwargs):
+    invalidate_account(instance.pk)
+
+
+@receiver([post_save, post_delete], sender=Lay)
+@receiver([post_save, post_delete], sender=WeeklyBonus)
+def account_data_changed(sender, instance, **kwargs):
+    invalidate_account(instance.user_id)
@@ -0,0 +1,75 @@
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+
+from core.money import to_float
+from .caching import account_version
+from .models import Lay, WeeklyBonus
+from .pagination import LayCursorPagination
+from .serializers import LaySerializer, WeeklyBonusSerializer
+from .utils import get_week_range
+
+
+def build_account_summary(user):
+    paginator = LayCursorPagination()
+    lays = paginator.paginate_after(Lay.objects.filter(user=user))
+    weekly_bonus = (
+        WeeklyBonus.objects.filter(user=user).order_by("-week_start").first()
+    )
+    return {
+        "balance": to_float(user.balance),
+        "weekly_cashback": to_float(user.weekly_cashback),
+        "active_lay": list(LaySerializer(lays, many=True).data),
+        "active_lay_next_cursor": paginator.next_cursor,
+        "weekly_bonus": dict(WeeklyBonusSerializer(weekly_bonus).data),
+        "email": user.email,
+    }
+
+
+def current_weekly_bonus(user):
+    """
+    This week's WeeklyBonus of `user`, read only. The row is created by the
+    week's first balance movement (utils.bump_weekly_bonus), which also keeps
+    its reward up to date; until then this is an unsaved zero row.
+    """
+    start, end = get_week_range()
+    bonus = WeeklyBonus.objects.filter(
+        user=user, week_start=start, week_end=end).first()
+    return bonus or WeeklyBonus(user=user, week_start=start, week_end=end)
+
+
+async def acurrent_weekly_bonus(user):
+    """Async version of current_weekly_bonus."""
+    start, end = get_week_range()
+    bonus = await WeeklyBonus.objects.filter(
+        user=user, week_start=start, week_end=end).afirst()
+    return bonus or WeeklyBonus(user=user, week_start=start, week_end=end)
+
+
+def summary_cache_key(user_id, version):
+    return f"accounts:summary:{user_id}:{version}"
+
+
+def get_account_summary(user, version=None):
+    """
+    Dashboard payload for `user`, served from the cache while the user's
+    account version is unchanged.
+    """
+    version = version or account_version(user.pk)
+    key = summary_cache_key(user.pk, version)
+    summary = cache.get(key)
+    if summary is None:
+        summary = build_account_summary(user)
+        cache.set(key, summary, settings.ACCOUNT_SUMMARY_CACHE_TIMEOUT)
+    return summary
+
+
+async def aget_account_summary(user, version=None):
+    """Async version of get_account_summary."""
+    version = version or await sync_to_async(account_version)(user.pk)
+    key = summary_cache_key(user.pk, version)
+    summary = await cache.aget(key)
+    if summary is None:
+        summary = await sync_to_async(build_account_summary)(user)
+        await cache.aset(key, summary, settings.ACCOUNT_SUMMARY_CACHE_TIMEOUT)
+    return summary
@@ -0,0 +1,78 @@
+import pytest
+from asgiref.sync import async_to_sync
+from django.test import AsyncClient
+from django.urls import path
+from rest_framework_simplejwt.tokens import AccessToken
+
+from accounts import async_views, views
+from accounts.models import DepositAddress, DepositRotation, WeeklyBonus
+from core.money import to_micros
+from authentication.models import CustomUser
+
+# Both versions side by side, whatever settings.ASYNC_MODE is
+urlpatterns = [
+    path("info/", async_views.AccountInfoView.as_view()),
+    path("sync/info/", views.AccountInfoView.as_view()),
+    path("weekly-bonus/current/", async_views.CurrentWeeklyBonusView.as_view()),
+    path("deposit/generate/", async_views.GenerateDepositAddressView.as_view()),
+]
+
+pytestmark = pytest.mark.urls(__name__)
+
+
+@pytest.fixture
+def user(db):
+    return CustomUser.objects.create_user(
+        email="async@example.com", password="pass1234", balance=to_micros(20),
+        is_active=True)
+
+
+@pytest.fixture
+def get(user):
+    authorization = {"Authorization": f"Bearer {AccessToken.for_user(user)}"}
+
+    def get(path, headers=None):
+        return async_to_sync(AsyncClient().get)(
+            path, headers={**authorization, **(headers or {})})
+    return get
+
+
+def test_account_info_matches_sync_view(get):
+    res = get("/info/")
+
+    assert res.status_code == 200
+    assert res.json()["balance"] == 20
+    assert res.content == get("/sync/info/").content
+    assert get("/info/", headers={"If-None-Match": res["ETag"]}).status_code == 304
+
+
+def test_requires_authentication(db):
+    res = async_to_sync(AsyncClient().get)("/info/")
+
+    assert res.status_code == 401
+    assert res.json() == {"detail": "Authentication credentials were not provided."}
+    assert res["WWW-Authenticate"].startswith("Bearer")
+
+
+def test_current_weekly_bonus_is_read_and_counted(get, user):
+    res = get("/weekly-bonus/current/")
+
+    assert res.status_code == 200
+    assert res.json()["weekly_balance"] == "0.000000"
+    assert not WeeklyBonus.objects.filter(user=user).exists()
+    # Queries made through sync_to_async still reach the request metrics
+    assert "queries" in res["Server-Timing"]
+    assert 'desc="0 queries"' not in res["Server-Timing"]
+
+
+def test_deposit_address_rotation(get):
+    DepositAddress.objects.all().delete()
+    DepositRotation.objects.all().delete()
+    for i in range(1, 4):
+        DepositAddress.objects.create(address=f"Deposit_Address_{i}", index=i)
+    DepositRotation.objects.create(current_index=1)
+
+    assert [get("/deposit/generate/").json()["address"] for _ in range(4)] == [
+        "Deposit_Address_1", "Deposit_Address_2", "Deposit_Address_3",
+        "Deposit_Address_1",
+    ]
@@ -5,16 +5,18 @@ from rest_framework import status
 from rest_framework.test import APIClient
 from PIL import Image
 
+from core.money import to_micros
 from authentication.models import CustomUser
 
 
 @pytest.fixture
 def create_user(db):
-    return CustomUser.objects.create_user(email="testuser@example.com", password="testpass123", balance=100)
+    return CustomUser.objects.create_user(email="testuser@example.com", password="testpass123", balance=to_micros(100))
 
 
 @pytest.fixture
-def auth_client(create_user):
+def auth_client(create_user, settings, tmp_path):
+    settings.LAY_UPLOAD_SPOOL_DIR = str(tmp_path / "spool")
     client = APIClient()
     client.force_authenticate(user=create_user)
     return client
@@ -25,9 +27,13 @@ def generate_image_file(name='test.jpg'):
     byte_arr = io.BytesIO()
     image.save(byte_arr, format='JPEG')
     byte_arr.seek(0)
+    byte_arr.name = name
     return byte_arr
 
 
+LAY_DETAILS = {"loss_payout": "5", "tip": "Over 2.5", "match": "A vs B"}
+
+
 def test_calculator_success(auth_client):
     image_file = generate_image_file()
     response = auth_client.post(
@@ -37,6 +43,7 @@ def test_calculator_success(auth_client):
             "stake_amount": 10,
             "win_payout": 50,
             "file": image_file,
+            **LAY_DETAILS,
         },
         format='multipart'
     )
@@ -51,10 +58,11 @@ def test_missing_file(auth_client):
             "total_odd": 5,
             "stake_amount": 10,
             "win_payout": 50,
+            **LAY_DETAILS,
         }
     )
     assert response.status_code == status.HTTP_400_BAD_REQUEST
-    assert response.json() == {"detail": "File field is required!"}
+    assert response.json() == {"detail": {"file": ["No file was submitted."]}}
 
 
 def test_invalid_data(auth_client):
@@ -64,10 +72,14 @@ def test_invalid_data(auth_client):
             "total_odd": 5,
             "stake_amount": 1000,
             "win_payout": 5000,
-        }
+            "file": generate_image_file(),
+            **LAY_DETAILS,
+        },
+        format='multipart'
     )
     assert response.status_code == status.HTTP_400_BAD_REQUEST
-    assert response.json() == {"detail": "Data is not valid!"}
+    assert response.json() == {
+        "detail": {"detail": ["Amount exceeds your current balance."]}}
 
 
 def test_unauthenticated_user():
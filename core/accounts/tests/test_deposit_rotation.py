@@ -41,3 +41,37 @@ def test_deposit_rotation_wraps_around(django_user_model):
 
     res = client.get("/api/v1/account/deposit/generate/")
     assert res.data["address"] == "Deposit_Address_1"
+
+@pytest.mark.django_db
+def test_deposit_rotation_follows_pool_changes(django_user_model):
+    user = django_user_model.objects.create_user(email="pool@example.com", password="pass1234")
+
+    DepositAddress.objects.all().delete()
+    DepositRotation.objects.all().delete()
+
+    for i in range(1, 4):
+        DepositAddress.objects.create(address=f"Deposit_Address_{i}", index=i)
+    DepositRotation.objects.create(current_index=1)
+
+    client = APIClient()
+    client.force_authenticate(user=user)
+
+    assert client.get("/api/v1/account/deposit/generate/").data["address"] == "Deposit_Address_1"
+
+    DepositAddress.objects.filter(index=3).delete()
+    served = [client.get("/api/v1/account/deposit/generate/").data["address"] for _ in range(3)]
+    assert served == ["Deposit_Address_2", "Deposit_Address_1", "Deposit_Address_2"]
+
+@pytest.mark.django_db
+def test_deposit_address_is_one_query_when_pool_is_cached(django_user_model, django_assert_num_queries):
+    from accounts.deposits import next_deposit_address
+
+    DepositAddress.objects.all().delete()
+    DepositRotation.objects.all().delete()
+    for i in range(1, 4):
+        DepositAddress.objects.create(address=f"Deposit_Address_{i}", index=i)
+    DepositRotation.objects.create(current_index=1)
+
+    assert next_deposit_address() == "Deposit_Address_1"
+    with django_assert_num_queries(1):
+        assert next_deposit_address() == "Deposit_Address_2"
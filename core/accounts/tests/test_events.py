@@ -0,0 +1,106 @@
+import asyncio
+import json
+
+import pytest
+from asgiref.sync import async_to_sync, sync_to_async
+from django.db import transaction
+from django.test import AsyncClient
+from django.urls import path
+from rest_framework_simplejwt.tokens import AccessToken
+
+from accounts import async_views
+from accounts.events import EVERYONE, hub, publish
+from accounts.models import Lay, LayStatus
+from core.money import to_micros
+from accounts.settlement import settle_lays
+from authentication.models import CustomUser
+
+urlpatterns = [path("events/", async_views.AccountEventsView.as_view())]
+
+pytestmark = pytest.mark.urls(__name__)
+
+
+@pytest.fixture
+def lay(db):
+    user = CustomUser.objects.create_user(
+        email="events@example.com", password="pass1234", balance=to_micros(90),
+        is_active=True)
+    return Lay.objects.create(
+        user=user, total_odds=5, stake_amount=to_micros(10),
+        win_payout=to_micros(50), file_name="slip.jpg", file="lays/slip.jpg")
+
+
+def received(user_id, change, count):
+    """Run the sync `change` and return the first `count` events pushed to `user_id`."""
+    async def scenario():
+        queue = hub.subscribe(user_id)
+        try:
+            await sync_to_async(change)()
+            return [await asyncio.wait_for(queue.get(), 1) for _ in range(count)]
+        finally:
+            hub.unsubscribe(user_id, queue)
+
+    return async_to_sync(scenario)()
+
+
+def test_lay_status_change_pushes_balance_and_status(lay, django_capture_on_commit_callbacks):
+    def approve():
+        with django_capture_on_commit_callbacks(execute=True):
+            lay.status = LayStatus.APPROVED
+            lay.save()
+
+    assert received(lay.user_id, approve, 2) == [
+        ("balance", '{"balance":140.0}'),
+        ("lay", json.dumps({"id": str(lay.pk), "status": "approved"}, separators=(",", ":"))),
+    ]
+
+
+def test_bulk_settlement_publishes_once_on_commit(lay, django_capture_on_commit_callbacks):
+    Lay.objects.create(
+        user=lay.user, total_odds=2, stake_amount=to_micros(1),
+        win_payout=to_micros(2), file_name="slip2.jpg", file="lays/slip2.jpg")
+
+    def settle():
+        with django_capture_on_commit_callbacks(execute=True) as callbacks:
+            settle_lays(Lay.objects.all(), LayStatus.APPROVED)
+        sends = [cb for cb in callbacks if getattr(cb, "func", None) == hub.dispatch]
+        assert len(sends) == 1
+
+    events = received(lay.user_id, settle, 3)
+    assert events[0] == ("balance", '{"balance":142.0}')
+    assert [event for event, _ in events[1:]] == ["lay", "lay"]
+
+
+def test_rolled_back_changes_are_not_pushed(lay, django_capture_on_commit_callbacks):
+    def rolled_back():
+        with django_capture_on_commit_callbacks(execute=True):
+            with pytest.raises(RuntimeError), transaction.atomic():
+                publish(lay.user_id, "lay", {"id": str(lay.pk)})
+                raise RuntimeError
+            publish(lay.user_id, "balance", {"balance": 1.0})
+
+    assert received(lay.user_id, rolled_back, 1) == [("balance", '{"balance":1.0}')]
+
+
+def test_event_stream(lay, settings):
+    settings.ACCOUNT_EVENTS_HEARTBEAT_SECONDS = 0.05
+    settings.ACCOUNT_EVENTS_STREAM_SECONDS = 0.3
+    token = AccessToken.for_user(lay.user)
+
+    async def scenario():
+        response = await AsyncClient().get(
+            "/events/", headers={"Authorization": f"Bearer {token}"})
+        chunks = []
+        async for chunk in response.streaming_content:
+            chunks.append(chunk.decode())
+            if len(chunks) == 1:
+                hub.dispatch([f"{EVERYONE} settlement {{}}"])
+        return response, chunks
+
+    response, chunks = async_to_sync(scenario)()
+
+    assert response["Content-Type"] == "text/event-stream"
+    assert chunks[0].startswith("retry: 3000\nevent: version\ndata: {\"etag\":")
+    assert chunks[1] == "event: settlement\ndata: {}\n\n"
+    # Then only keepalives until the stream ends for the client to reconnect
+    assert set(chunks[2:]) == {": keepalive\n\n"}
@@ -0,0 +1,107 @@
+import time
+from unittest import mock
+
+import pytest
+from django.utils.http import http_date
+from rest_framework.test import APIClient
+
+from accounts.caching import account_last_modified, account_version
+from accounts.models import Lay
+from core.money import to_micros
+from authentication.models import CustomUser
+
+
+@pytest.fixture
+def user_with_lays(db):
+    user = CustomUser.objects.create_user(
+        email="history@example.com", password="pass1234", balance=to_micros(100))
+    for i in range(25):
+        Lay.objects.create(
+            user=user, total_odds=2, stake_amount=to_micros(1),
+            win_payout=to_micros(2),
+            file_name=f"slip_{i}.jpg", file=f"lays/slip_{i}.jpg")
+    return user
+
+
+@pytest.fixture
+def api_client(user_with_lays):
+    client = APIClient()
+    client.force_authenticate(user=user_with_lays)
+    return client
+
+
+def test_account_info_returns_first_page_only(api_client):
+    res = api_client.get("/api/v1/account/info/")
+    assert res.status_code == 200
+    assert len(res.data["active_lay"]) == 10
+    assert res.data["active_lay_next_cursor"]
+
+
+def test_lay_feed_walks_full_history_without_duplicates(api_client, user_with_lays):
+    seen = []
+    cursor = None
+    while True:
+        params = {"cursor": cursor} if cursor else {}
+        res = api_client.get("/api/v1/account/lays/", params)
+        assert res.status_code == 200
+        seen += [lay["id"] for lay in res.data["results"]]
+        cursor = res.data["next_cursor"]
+        if not cursor:
+            break
+
+    expected = [
+        str(pk) for pk in Lay.objects.filter(user=user_with_lays)
+        .order_by("-created_at", "-id").values_list("id", flat=True)
+    ]
+    assert seen == expected
+
+
+def test_lay_feed_rejects_garbage_cursor(api_client):
+    res = api_client.get("/api/v1/account/lays/", {"cursor": "not-a-cursor"})
+    assert res.status_code == 404
+
+
+def test_account_info_is_served_from_cache_until_data_changes(
+        api_client, user_with_lays, django_assert_num_queries):
+    first = api_client.get("/api/v1/account/info/")
+    etag = first["ETag"]
+
+    with django_assert_num_queries(0):
+        res = api_client.get("/api/v1/account/info/", HTTP_IF_NONE_MATCH=etag)
+    assert res.status_code == 304
+
+    with django_assert_num_queries(0):
+        res = api_client.get("/api/v1/account/info/")
+    assert res.data == first.data
+
+    lay = Lay.objects.filter(user=user_with_lays).first()
+    lay.status = "approved"
+    lay.save()
+
+    res = api_client.get("/api/v1/account/info/", HTTP_IF_NONE_MATCH=etag)
+    assert res.status_code == 200
+    assert res["ETag"] != etag
+
+
+def test_lay_feed_answers_if_modified_since(api_client):
+    later = time.time() + 2
+    with mock.patch("accounts.conditional.time.time", return_value=later):
+        first = api_client.get("/api/v1/account/lays/")
+        assert first.status_code == 200
+
+        res = api_client.get(
+            "/api/v1/account/lays/", HTTP_IF_MODIFIED_SINCE=first["Last-Modified"])
+    assert res.status_code == 304
+    assert res["ETag"] == first["ETag"]
+
+
+def test_no_last_modified_within_the_second_of_a_change(api_client, user_with_lays):
+    # A second change in the same second would not move a whole-second date
+    changed_at = account_last_modified(account_version(user_with_lays.pk))
+    with mock.patch("accounts.conditional.time.time", return_value=changed_at):
+        first = api_client.get("/api/v1/account/lays/")
+        assert "Last-Modified" not in first
+
+        res = api_client.get(
+            "/api/v1/account/lays/", HTTP_IF_MODIFIED_SINCE=http_date(changed_at))
+    assert res.status_code == 200
@@ -0,0 +1,101 @@
+import pytest
+from rest_framework.test import APIClient
+
+from accounts.models import Lay, LayStatus, WeeklyBonus, WeeklyLedgerEntry
+from core.money import to_micros
+from authentication.models import CustomUser
+
+
+@pytest.fixture
+def lay(db):
+    user = CustomUser.objects.create_user(
+        email="bettor@example.com", password="pass1234", balance=to_micros(90))
+    return Lay.objects.create(
+        user=user, total_odds=5, stake_amount=to_micros(10),
+        win_payout=to_micros(50), loss_payout=to_micros("12.5"), file_name="slip.jpg", file="lays/slip.jpg")
+
+
+def test_approving_lay_credits_wallet_and_weekly_balance(lay):
+    lay.status = LayStatus.APPROVED
+    lay.save()
+
+    lay.user.refresh_from_db()
+    assert lay.user.balance == to_micros(140)
+    bonus = WeeklyBonus.objects.get(user=lay.user)
+    assert bonus.weekly_balance == to_micros(40)
+    assert bonus.weekly_reward == 0
+    assert WeeklyLedgerEntry.objects.get().delta == to_micros(40)
+
+
+def test_flipping_status_reverts_previous_effect(lay):
+    lay.status = LayStatus.APPROVED
+    lay.save()
+    lay = Lay.objects.get(pk=lay.pk)
+    lay.status = LayStatus.DECLINED
+    lay.save()
+
+    lay.user.refresh_from_db()
+    assert lay.user.balance == to_micros("102.5")
+    bonus = WeeklyBonus.objects.get(user=lay.user)
+    assert bonus.weekly_balance == to_micros(-10)
+    assert bonus.weekly_reward == to_micros(2)
+    totals = list(WeeklyLedgerEntry.objects.weekly_totals())
+    assert totals[0]["total"] == to_micros(-10)
+
+
+def test_status_change_is_one_insert_and_in_place_updates(lay, django_assert_num_queries):
+    lay.status = LayStatus.DECLINED
+    lay.save()  # first movement of the week creates the bonus row
+    lay = Lay.objects.get(pk=lay.pk)
+    lay.status = LayStatus.APPROVED
+
+    # UPDATE lay, INSERT ledger entry, UPDATE bonus, UPDATE user
+    with django_assert_num_queries(4):
+        lay.save()
+
+
+@pytest.fixture
+def staff_client(db):
+    staff = CustomUser.objects.create_user(
+        email="staff@example.com", password="pass1234", is_staff=True)
+    client = APIClient()
+    client.force_authenticate(user=staff)
+    return client
+
+
+def test_bulk_settlement_matches_per_lay_bookkeeping(lay, staff_client):
+    more = [
+        Lay.objects.create(
+            user=lay.user, total_odds=2, stake_amount=to_micros(5),
+            win_payout=to_micros(10), loss_payout=to_micros(1), file_name="slip.jpg", file="lays/slip.jpg")
+        for _ in range(3)
+    ]
+    ids = [str(lay.pk)] + [str(other.pk) for other in more]
+
+    res = staff_client.post(
+        "/api/v1/account/lays/settle/", {"ids": ids, "status": "approved"},
+        format="json")
+
+    assert res.status_code == 200
+    assert res.data == {"settled": 4, "users": 1}
+    lay.user.refresh_from_db()
+    assert lay.user.balance == to_micros(90 + 50 + 3 * 10)
+    bonus = WeeklyBonus.objects.get(user=lay.user)
+    assert bonus.weekly_balance == to_micros(40 + 3 * 5)
+    assert WeeklyLedgerEntry.objects.count() == 4
+    assert not Lay.objects.exclude(status=LayStatus.APPROVED).exists()
+
+    # Settling again to the same status is a no-op
+    res = staff_client.post(
+        "/api/v1/account/lays/settle/", {"ids": ids, "status": "approved"},
+        format="json")
+    assert res.data == {"settled": 0, "users": 0}
+
+
+def test_bulk_settlement_requires_staff(lay):
+    client = APIClient()
+    client.force_authenticate(user=lay.user)
+    res = client.post(
+        "/api/v1/account/lays/settle/",
+        {"ids": [str(lay.pk)], "status": "approved"}, format="json")
+    assert res.status_code == 403
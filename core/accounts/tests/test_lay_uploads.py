@@ -0,0 +1,150 @@
+import hashlib
+import io
+import os
+from unittest import mock
+
+import pytest
+from django.core.files.storage import default_storage
+from PIL import Image
+from rest_framework.test import APIClient
+
+from accounts.models import Lay, LayImage
+from core.money import to_micros
+from accounts import uploads
+from accounts.uploads import push_lay_upload
+from authentication.models import CustomUser
+
+
+@pytest.fixture
+def upload_settings(settings, tmp_path):
+    settings.MEDIA_ROOT = str(tmp_path / "media")
+    settings.LAY_UPLOAD_SPOOL_DIR = str(tmp_path / "spool")
+    return settings
+
+
+@pytest.fixture
+def auth_client(db):
+    user = CustomUser.objects.create_user(
+        email="uploader@example.com", password="pass1234", balance=to_micros(100))
+    client = APIClient()
+    client.force_authenticate(user=user)
+    return client
+
+
+def generate_image_file(name="slip.png", size=(100, 100)):
+    image = Image.new("RGBA", size)
+    byte_arr = io.BytesIO()
+    image.save(byte_arr, format="PNG")
+    byte_arr.seek(0)
+    byte_arr.name = name
+    return byte_arr
+
+
+def test_lay_is_created_without_touching_storage(upload_settings, auth_client):
+    upload = generate_image_file(size=(3000, 1500))
+    digest = hashlib.sha256(upload.getvalue()).hexdigest()
+    with mock.patch("accounts.views.schedule_lay_upload") as schedule:
+        response = auth_client.post(
+            "/api/v1/account/calculator/",
+            {
+                "total_odd": 5,
+                "stake_amount": 10,
+                "win_payout": 50,
+                "loss_payout": "5",
+                "tip": "Over 2.5",
+                "match": "A vs B",
+                "file": upload,
+            },
+            format="multipart",
+        )
+    assert response.status_code == 200
+
+    lay = Lay.objects.get()
+    assert not lay.file
+    assert os.path.exists(lay.spool_path)
+    schedule.assert_called_once_with(lay.pk, digest)
+
+    # The digest from spooling is reused; the file is not read again
+    with mock.patch.object(uploads, "file_sha256") as rehash:
+        push_lay_upload(lay.pk, digest)
+    rehash.assert_not_called()
+
+    lay.refresh_from_db()
+    assert lay.spool_path == ""
+    assert lay.file.name.startswith("lays/")
+    assert default_storage.exists(lay.file.name)
+
+
+def test_pushed_image_is_normalized_with_variants(upload_settings, auth_client):
+    auth_client.post(
+        "/api/v1/account/calculator/",
+        {
+            "total_odd": 5, "stake_amount": 10, "win_payout": 50,
+            "loss_payout": "5", "tip": "Over 2.5", "match": "A vs B",
+            "file": generate_image_file(size=(3000, 1500)),
+        },
+        format="multipart",
+    )
+    lay = Lay.objects.get()
+    push_lay_upload(lay.pk)
+    lay.refresh_from_db()
+
+    expected = {
+        lay.file: upload_settings.LAY_IMAGE_MAX_DIMENSION,
+        lay.preview: upload_settings.LAY_IMAGE_PREVIEW_DIMENSION,
+        lay.thumbnail: upload_settings.LAY_IMAGE_THUMBNAIL_DIMENSION,
+    }
+    for field, longest_side in expected.items():
+        with default_storage.open(field.name) as fh, Image.open(fh) as image:
+            assert image.format == "JPEG"
+            assert image.size == (longest_side, longest_side // 2)
+            assert not image.getexif()
+
+
+def test_identical_uploads_share_one_stored_image(upload_settings, auth_client):
+    payload = {
+        "total_odd": 5, "stake_amount": 10, "win_payout": 50,
+        "loss_payout": "5", "tip": "Over 2.5", "match": "A vs B",
+    }
+    auth_client.post(
+        "/api/v1/account/calculator/",
+        {**payload, "file": generate_image_file()}, format="multipart")
+    first = Lay.objects.get()
+    push_lay_upload(first.pk)
+    first.refresh_from_db()
+
+    auth_client.post(
+        "/api/v1/account/calculator/",
+        {**payload, "file": generate_image_file(name="again.png")}, format="multipart")
+    second = Lay.objects.exclude(pk=first.pk).get()
+
+    # Known content: linked straight away, nothing spooled or uploaded
+    assert second.spool_path == ""
+    assert second.image_id == first.image_id
+    assert second.file.name == first.file.name
+    assert LayImage.objects.count() == 1
+    assert len(os.listdir(upload_settings.MEDIA_ROOT + "/lays")) == 3
+
+
+def test_lost_spool_file_marks_the_lay_failed(upload_settings, auth_client):
+    with mock.patch("accounts.views.schedule_lay_upload"):
+        auth_client.post(
+            "/api/v1/account/calculator/",
+            {
+                "total_odd": 5, "stake_amount": 10, "win_payout": 50,
+                "loss_payout": "5", "tip": "Over 2.5", "match": "A vs B",
+                "file": generate_image_file(),
+            },
+            format="multipart",
+        )
+    lay = Lay.objects.get()
+    # As on a host other than the one that took the upload
+    os.remove(lay.spool_path)
+
+    assert uploads.push_pending_uploads() == (0, 1)
+
+    lay.refresh_from_db()
+    assert lay.spool_path == ""
+    assert lay.upload_failed
+    assert not lay.file
+    assert uploads.push_pending_uploads() == (0, 0)
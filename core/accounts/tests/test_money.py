@@ -0,0 +1,37 @@
+from decimal import Decimal
+
+import pytest
+
+from accounts.models import Lay, WeeklyBonus
+from core.money import MoneySerializerField, from_micros, to_micros
+from accounts.serializers import LaySerializer
+
+
+def test_to_micros_is_exact_for_float_inputs():
+    assert to_micros(0.1) == 100_000
+    assert to_micros("12.5") == 12_500_000
+    assert to_micros("") == 0
+    assert from_micros(to_micros(0.1) * 3) == Decimal("0.300000")
+    with pytest.raises(ValueError):
+        to_micros("abc")
+
+
+def test_serializer_field_keeps_api_shape():
+    field = MoneySerializerField()
+    assert field.to_internal_value("2.5") == 2_500_000
+    assert field.to_representation(2_500_000) == 2.5
+    assert MoneySerializerField(as_string=True).to_representation(5) == "0.000005"
+
+
+def test_lay_serializer_renders_units():
+    lay = Lay(total_odds=2, stake_amount=to_micros(10), win_payout=to_micros(20),
+              loss_payout=to_micros("1.5"))
+    data = LaySerializer(lay).data
+    assert data["stake_amount"] == 10.0
+    assert data["win_payout"] == 20.0
+    assert data["loss_payout"] == "1.500000"
+
+
+def test_weekly_reward_rounds_down_to_the_micro():
+    bonus = WeeklyBonus(weekly_balance=-7)
+    assert bonus.calculate_reward() == 1
@@ -0,0 +1,114 @@
+"""
+Query-plan checks for the hot accounts querysets. Each queryset is
+EXPLAINed against a fixture large enough that a missing index would show
+up as a full table scan.
+"""
+import datetime
+import re
+
+import pytest
+from django.db import connection
+from django.utils import timezone
+
+from accounts.models import Lay, LayStatus, WeeklyBonus, WithdrawRequest
+from accounts.utils import get_week_range
+from authentication.models import CustomUser
+
+USERS = 20
+LAYS_PER_USER = 50
+WEEKS = 30
+
+
+def sequential_scans(queryset):
+    """Tables the database would read in full to answer `queryset`."""
+    if connection.vendor == "postgresql":
+        # Small test tables are cheaper to scan; only fail if no index fits
+        with connection.cursor() as cursor:
+            cursor.execute("SET LOCAL enable_seqscan = off")
+        plan = queryset.explain()
+        return re.findall(r"Seq Scan on (\w+)", plan)
+    plan = queryset.explain()
+    return [
+        match.group(1)
+        for match in re.finditer(r"\bSCAN (\w+)(.*)", plan)
+        if "INDEX" not in match.group(2)
+    ]
+
+
+def assert_uses_index(queryset):
+    scans = sequential_scans(queryset)
+    assert not scans, f"Sequential scan on {scans}:\n{queryset.explain()}"
+
+
+@pytest.fixture
+def big_schema(db):
+    users = CustomUser.objects.bulk_create(
+        CustomUser(email=f"plan{i}@example.com") for i in range(USERS))
+    start = timezone.now() - datetime.timedelta(days=LAYS_PER_USER)
+    statuses = [LayStatus.APPROVED] * 18 + [LayStatus.DECLINED, LayStatus.PENDING]
+    Lay.objects.bulk_create(
+        Lay(user=user, total_odds=2, stake_amount=1, win_payout=2,
+            file_name="slip.jpg", status=statuses[i % len(statuses)],
+            spool_path="spool/slip.jpg" if i == 0 else "",
+            created_at=start + datetime.timedelta(days=i))
+        for user in users for i in range(LAYS_PER_USER)
+    )
+    week_start, week_end = get_week_range()
+    WeeklyBonus.objects.bulk_create(
+        WeeklyBonus(user=user,
+                    week_start=week_start - datetime.timedelta(weeks=w),
+                    week_end=week_end - datetime.timedelta(weeks=w),
+                    weekly_balance=-5 if w == 0 else 0)
+        for user in users for w in range(WEEKS)
+    )
+    WithdrawRequest.objects.bulk_create(
+        WithdrawRequest(user=user, amount=1, address=f"addr-{user.pk}-{i}")
+        for user in users for i in range(10)
+    )
+    with connection.cursor() as cursor:
+        cursor.execute("ANALYZE")
+    return users
+
+
+def test_lay_history_page_uses_user_index(big_schema):
+    assert_uses_index(
+        Lay.objects.filter(user=big_schema[0])
+        .order_by("-created_at", "-id")[:11])
+
+
+def test_admin_lay_queues_use_indexes(big_schema):
+    assert_uses_index(
+        Lay.objects.filter(status=LayStatus.PENDING).order_by("-created_at")[:100])
+    assert_uses_index(Lay.objects.order_by("-created_at")[:100])
+    assert_uses_index(Lay.objects.exclude(spool_path="").values("pk"))
+
+
+def test_weekly_bonus_lookups_use_indexes(big_schema):
+    week_start, week_end = get_week_range()
+    assert_uses_index(
+        WeeklyBonus.objects.filter(user=big_schema[0]).order_by("-week_start")[:1])
+    assert_uses_index(
+        WeeklyBonus.objects.filter(
+            user=big_schema[0], week_start=week_start, week_end=week_end))
+    assert_uses_index(
+        WeeklyBonus.objects.exclude(weekly_balance=0, weekly_reward=0)
+        .order_by("pk").values("pk"))
+    assert_uses_index(WeeklyBonus.objects.order_by("-week_start")[:100])
+
+
+def test_withdraw_admin_listing_uses_index(big_schema):
+    assert_uses_index(WithdrawRequest.objects.order_by("-created_at")[:100])
+
+
+def test_withdraw_address_search_uses_expression_index(big_schema):
+    if connection.vendor != "postgresql":
+        pytest.skip("SQLite runs iexact as LIKE, which no expression index serves")
+    assert_uses_index(
+        WithdrawRequest.objects.filter(address__iexact="ADDR-1-1"))
+
+
+def test_admin_substring_searches_use_trigram_indexes(big_schema):
+    if connection.vendor != "postgresql":
+        pytest.skip("Trigram indexes are PostgreSQL only")
+    assert_uses_index(CustomUser.objects.filter(email__icontains="plan1"))
+    assert_uses_index(Lay.objects.filter(file_name__icontains="slip"))
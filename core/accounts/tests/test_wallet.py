@@ -0,0 +1,26 @@
+import pytest
+
+from accounts import wallet
+from core.money import to_micros
+from authentication.models import CustomUser
+
+
+@pytest.fixture
+def user(db):
+    return CustomUser.objects.create_user(
+        email="wallet@example.com", password="pass1234", balance=to_micros(20))
+
+
+def test_debit_is_one_conditional_update(user, django_assert_num_queries):
+    with django_assert_num_queries(1):
+        assert wallet.debit(user.pk, to_micros(15)) == to_micros(5)
+
+    with pytest.raises(wallet.InsufficientFunds):
+        wallet.debit(user.pk, to_micros(10))
+    user.refresh_from_db()
+    assert user.balance == to_micros(5)
+
+
+def test_adjust_credits_and_debits_unconditionally(user):
+    assert wallet.credit(user.pk, to_micros("2.5")) == to_micros("22.5")
+    assert wallet.adjust(user.pk, to_micros(-30)) == to_micros("-7.5")
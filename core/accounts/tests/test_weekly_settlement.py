@@ -0,0 +1,120 @@
+import datetime
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from accounts.models import WeeklyBonus, WeeklySettlement
+from core.money import to_micros
+from accounts.settlement import settle_weekly_bonuses
+from accounts.utils import apply_weekly_delta, get_week_range
+from authentication.models import CustomUser
+
+MONDAY = datetime.date(2025, 9, 8)
+LAST_WEEK = (datetime.date(2025, 9, 1), datetime.date(2025, 9, 7))
+
+
+@pytest.fixture
+def bonuses(db):
+    loser = CustomUser.objects.create_user(
+        email="loser@example.com", password="pass1234", balance=to_micros(10))
+    winner = CustomUser.objects.create_user(
+        email="winner@example.com", password="pass1234", balance=to_micros(10))
+    WeeklyBonus.objects.create(
+        user=loser, week_start=LAST_WEEK[0], week_end=LAST_WEEK[1],
+        weekly_balance=to_micros(-50), weekly_reward=to_micros(10))
+    WeeklyBonus.objects.create(
+        user=winner, week_start=LAST_WEEK[0], week_end=LAST_WEEK[1],
+        weekly_balance=to_micros(30), weekly_reward=0)
+    return loser, winner
+
+
+def test_settlement_credits_rewards_and_resets_counters(bonuses):
+    loser, winner = bonuses
+
+    result = settle_weekly_bonuses(today=MONDAY, chunk_size=1)
+
+    assert result.week_start == LAST_WEEK[0]
+    assert result.bonuses_reset == 2
+    assert result.users_credited == 1
+    assert result.total_credited == to_micros(10)
+    loser.refresh_from_db()
+    winner.refresh_from_db()
+    assert loser.balance == to_micros(20)
+    assert winner.balance == to_micros(10)
+    assert not WeeklyBonus.objects.exclude(
+        weekly_balance=0, weekly_reward=0).exists()
+
+
+def test_settlement_leaves_the_current_week_open(bonuses):
+    loser, _ = bonuses
+    current = WeeklyBonus.objects.create(
+        user=loser, week_start=MONDAY, week_end=MONDAY + datetime.timedelta(days=6),
+        weekly_balance=to_micros(-100), weekly_reward=to_micros(20))
+
+    result = settle_weekly_bonuses(today=MONDAY + datetime.timedelta(days=2))
+
+    assert result.week_start == LAST_WEEK[0]
+    assert result.bonuses_reset == 2
+    loser.refresh_from_db()
+    assert loser.balance == to_micros(20)
+    current.refresh_from_db()
+    assert current.weekly_balance == to_micros(-100)
+    assert current.weekly_reward == to_micros(20)
+
+
+def test_settlement_rerun_for_same_week_is_a_noop(bonuses):
+    loser, _ = bonuses
+    settle_weekly_bonuses(today=MONDAY)
+    WeeklyBonus.objects.filter(user=loser).update(weekly_reward=to_micros(5))
+
+    result = settle_weekly_bonuses(today=MONDAY)
+
+    assert result.already_settled
+    loser.refresh_from_db()
+    assert loser.balance == to_micros(20)
+    assert WeeklySettlement.objects.count() == 1
+
+
+def test_current_week_is_read_without_writing(db):
+    user = CustomUser.objects.create_user(
+        email="reader@example.com", password="pass1234")
+    client = APIClient()
+    client.force_authenticate(user=user)
+    url = "/api/v1/account/weekly-bonus/current/"
+
+    with CaptureQueriesContext(connection) as ctx:
+        res = client.get(url)
+    week_start, week_end = get_week_range()
+    assert res.json() == {
+        "id": None, "week_start": str(week_start), "week_end": str(week_end),
+        "weekly_balance": "0.000000", "weekly_reward": "0.000000",
+    }
+    assert not WeeklyBonus.objects.exists()
+    assert all(q["sql"].startswith("SELECT") for q in ctx)
+
+    # The first movement of the week creates the row
+    apply_weekly_delta(
+        user=user, reference_date=week_start, delta=to_micros(-10))
+    res = client.get(url)
+    assert res.json()["weekly_balance"] == "-10.000000"
+    assert res.json()["weekly_reward"] == "2.000000"
+
+
+def test_weekly_bonus_list_is_newest_first_and_conditional(bonuses):
+    loser, _ = bonuses
+    WeeklyBonus.objects.create(
+        user=loser, week_start=MONDAY, week_end=MONDAY + datetime.timedelta(days=6))
+    client = APIClient()
+    client.force_authenticate(user=loser)
+    url = "/api/v1/account/weekly-bonus/"
+
+    res = client.get(url)
+    assert res.status_code == 200
+    assert [row["week_start"] for row in res.json()["results"]] == [
+        str(MONDAY), str(LAST_WEEK[0])]
+    assert client.get(url, HTTP_IF_NONE_MATCH=res["ETag"]).status_code == 304
+
+    apply_weekly_delta(user=loser, reference_date=MONDAY, delta=to_micros(-10))
+    assert client.get(url, HTTP_IF_NONE_MATCH=res["ETag"]).status_code == 200
@@ -4,6 +4,8 @@ import pytest
 from django.contrib.auth import get_user_model
 from rest_framework.test import APIClient
 
+from core.money import to_micros
+
 User = get_user_model()
 
 @pytest.fixture
@@ -12,7 +14,7 @@ def create_user_with_balance(db):
         email="testuser@example.com",
         password="testpassword123"
     )
-    user.balance = 1.0
+    user.balance = to_micros(1)
     user.is_active = True
     user.save()
     return user
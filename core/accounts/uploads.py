@@ -0,0 +1,186 @@
+import hashlib
+import logging
+import os
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from django.conf import settings
+from django.core.files import File
+from django.db import IntegrityError, connection, transaction
+from PIL import Image
+
+from core.instrumentation import track_io
+
+from .caching import invalidate_account
+from .images import normalize_lay_image
+from .models import Lay, LayImage
+
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=settings.LAY_UPLOAD_WORKERS,
+            thread_name_prefix="lay-upload",
+        )
+    return _executor
+
+
+def spool_upload(uploaded_file):
+    """
+    Stream an uploaded file to the local spool directory chunk by chunk,
+    hashing as it goes. Returns (path, sha256 hex digest). Local disk only;
+    the object store is not touched here.
+    """
+    spool_dir = Path(settings.LAY_UPLOAD_SPOOL_DIR)
+    spool_dir.mkdir(parents=True, exist_ok=True)
+    path = spool_dir / f"{uuid.uuid4().hex}{Path(uploaded_file.name).suffix}"
+    digest = hashlib.sha256()
+    with track_io("spool"), open(path, "wb") as fh:
+        for chunk in uploaded_file.chunks():
+            digest.update(chunk)
+            fh.write(chunk)
+    return str(path), digest.hexdigest()
+
+
+def file_sha256(path, chunk_size=64 * 1024):
+    digest = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for chunk in iter(lambda: fh.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def lay_image_fields(image):
+    """Lay column values that point a lay at a stored LayImage."""
+    return {
+        "image": image,
+        "file": image.file.name,
+        "preview": image.preview.name,
+        "thumbnail": image.thumbnail.name,
+    }
+
+
+def discard_spooled(path):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def store_lay_image(spool_path, digest):
+    """
+    Normalize a spooled screenshot and store it with its preview and
+    thumbnail under content-addressed names. Returns the LayImage.
+    """
+    suffix = Path(spool_path).suffix
+    with open(spool_path, "rb") as fh:
+        try:
+            variants = normalize_lay_image(fh)
+            names = {
+                "file": f"{digest}.jpg",
+                "preview": f"{digest}_preview.jpg",
+                "thumbnail": f"{digest}_thumb.jpg",
+            }
+        except (OSError, Image.DecompressionBombError):
+            logger.warning("Image %s could not be normalized, storing as is", digest)
+            fh.seek(0)
+            variants = {"file": File(fh)}
+            names = {"file": f"{digest}{suffix}"}
+
+        stored = {}
+        for field_name, content in variants.items():
+            field = LayImage._meta.get_field(field_name)
+            name = field.generate_filename(None, names[field_name])
+            with track_io("storage"):
+                stored[field_name] = field.storage.save(
+                    name, content, max_length=field.max_length)
+
+    try:
+        with transaction.atomic():
+            return LayImage.objects.create(sha256=digest, **stored)
+    except IntegrityError:
+        # Another worker stored the same content first; keep theirs and drop
+        # any of our objects that didn't land on the same content-addressed name
+        image = LayImage.objects.get(sha256=digest)
+        kept = {image.file.name, image.preview.name, image.thumbnail.name}
+        for name in set(stored.values()) - kept:
+            image.file.storage.delete(name)
+        return image
+
+
+def push_lay_upload(lay_id, digest=None):
+    """
+    Attach a lay's spooled screenshot to its content-addressed LayImage,
+    storing the image only if that content has never been seen. Uses a
+    queryset update, so the Lay.save wallet path is not re-run.
+
+    `digest` is the SHA-256 computed while spooling; without it (retries)
+    the spool file is hashed again.
+
+    Returns False if the spool file is gone (the spool is local to the
+    host that took the upload, and may not survive a restart): the lay is
+    then marked `upload_failed` and no longer retried.
+    """
+    lay = Lay.objects.only("id", "user_id", "spool_path").filter(
+        pk=lay_id).first()
+    if lay is None or not lay.spool_path:
+        return True
+
+    if not os.path.exists(lay.spool_path):
+        logger.error("Spooled upload %s for lay %s is gone, giving up",
+                     lay.spool_path, lay.pk)
+        Lay.objects.filter(pk=lay.pk).update(spool_path="", upload_failed=True)
+        invalidate_account(lay.user_id)
+        return False
+
+    digest = digest or file_sha256(lay.spool_path)
+    image = LayImage.objects.filter(sha256=digest).first()
+    if image is None:
+        image = store_lay_image(lay.spool_path, digest)
+
+    Lay.objects.filter(pk=lay.pk).update(
+        spool_path="", **lay_image_fields(image))
+    invalidate_account(lay.user_id)
+    discard_spooled(lay.spool_path)
+    return True
+
+
+def _push_in_background(lay_id, digest):
+    try:
+        push_lay_upload(lay_id, digest)
+    except Exception:
+        # The spool file stays put; `push_lay_uploads` will retry it
+        logger.exception("Failed to push upload for lay %s", lay_id)
+    finally:
+        connection.close()
+
+
+def schedule_lay_upload(lay_id, digest):
+    """Hand the storage upload to the worker pool once the lay is committed."""
+    transaction.on_commit(
+        lambda: _get_executor().submit(_push_in_background, lay_id, digest))
+
+
+def push_pending_uploads():
+    """
+    Push every lay still waiting on the spool. Returns (pushed, failed);
+    lays whose spool file is gone count as failed and are not retried.
+    """
+    pushed = failed = 0
+    for lay_id in Lay.objects.exclude(spool_path="").values_list("pk", flat=True):
+        try:
+            if push_lay_upload(lay_id):
+                pushed += 1
+            else:
+                failed += 1
+        except Exception:
+            logger.exception("Failed to push upload for lay %s", lay_id)
+            failed += 1
+    return pushed, failed
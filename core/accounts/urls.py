@@ -1,11 +1,34 @@
+from django.conf import settings
 from django.urls import path
-from .views import AccountInfoView, DepositClickViewView, GenerateDepositAddressView, WithdrawRequestView, CalculatorView
+from . import async_views
+from .views import AccountInfoView, DepositClickViewView, GenerateDepositAddressView, WithdrawRequestView, CalculatorView, LayListView, LaySettlementView, WeeklyBonusViewSet
+
+# The event stream holds its connection open, so it is only served by the
+# async workers
+async_only = []
+
+if settings.ASYNC_MODE:
+    async_only.append(path("events/", async_views.AccountEventsView.as_view(),
+                           name="account-events"))
+    account_info = async_views.AccountInfoView.as_view()
+    deposit_generate = async_views.GenerateDepositAddressView.as_view()
+    weekly_bonus_current = async_views.CurrentWeeklyBonusView.as_view()
+else:
+    account_info = AccountInfoView.as_view()
+    deposit_generate = GenerateDepositAddressView.as_view()
+    weekly_bonus_current = WeeklyBonusViewSet.as_view({"get": "current"})
 
 urlpatterns = [
-    path('info/', AccountInfoView.as_view(), name='account-info'),
-    path("deposit/generate/", GenerateDepositAddressView.as_view(),
-         name="deposit-generate"),
+    path('info/', account_info, name='account-info'),
+    path('lays/', LayListView.as_view(), name='lay-list'),
+    path('lays/settle/', LaySettlementView.as_view(), name='lay-settle'),
+    path("deposit/generate/", deposit_generate, name="deposit-generate"),
+    path("weekly-bonus/", WeeklyBonusViewSet.as_view({"get": "list"}),
+         name="weekly-bonus-list"),
+    path("weekly-bonus/current/", weekly_bonus_current,
+         name="weekly-bonus-current"),
     path("withdraw/", WithdrawRequestView.as_view(), name="withdraw"),
     path("calculator/", CalculatorView.as_view(), name="calculator"),
     path("deposit-click/", DepositClickViewView.as_view(), name="deposit"),
+    *async_only,
 ]
@@ -1,9 +1,15 @@
 # utils.py
-from django.db import transaction
-from decimal import Decimal
+from django.db import IntegrityError, transaction
+from django.db.models import BigIntegerField, F, Value
+from django.db.models.functions import Greatest
 import datetime
+import time
 from django.utils.timezone import now
 
+from core.metrics import WEEKLY_DELTA_LOCK_WAIT_SECONDS
+
+from .caching import invalidate_account
+
 
 def get_week_range(date=None):
     """Returns Monday–Sunday date range for the given date (default today)."""
@@ -14,22 +20,71 @@ def get_week_range(date=None):
     return start, end
 
 
-@transaction.atomic
-def apply_weekly_delta(*, user, reference_date, delta):
+def weekly_reward_expression(balance):
+    """
+    SQL version of WeeklyBonus.calculate_reward: 20% of a negative balance.
+    Integer division, so the reward is rounded down to the micro.
+    """
+    return Greatest(
+        Value(0),
+        -balance / Value(5),
+        output_field=BigIntegerField(),
+    )
+
+
+@transaction.atomic(savepoint=False)
+def apply_weekly_delta(*, user, reference_date, delta, lay=None):
     """
     Adjust user's WeeklyBonus for the week that includes reference_date.
     Recalculate reward after applying delta.
+
+    Appends a WeeklyLedgerEntry and bumps the bonus row in place with F()
+    expressions, so no row needs to be read or locked first.
     """
     # ⬇️ Import here to avoid models<->utils circular import at import time
-    from .models import WeeklyBonus
+    from .models import WeeklyLedgerEntry
+
+    delta = int(delta)
+    if not delta:
+        return
 
+    user_id = getattr(user, "pk", user)
     week_start, week_end = get_week_range(reference_date)
-    bonus, _ = WeeklyBonus.objects.select_for_update().get_or_create(
-        user=user, week_start=week_start, week_end=week_end
+    WeeklyLedgerEntry.objects.create(
+        user_id=user_id, lay=lay, week_start=week_start, delta=delta)
+    bump_weekly_bonus(user_id, week_start, week_end, delta)
+
+
+def bump_weekly_bonus(user_id, week_start, week_end, delta):
+    """
+    Add `delta` to the WeeklyBonus row in place and recompute the reward in
+    SQL, creating the row on the first movement of the week.
+    """
+    from .models import WeeklyBonus
+
+    invalidate_account(user_id)
+    new_balance = F("weekly_balance") + Value(delta)
+    bonus = WeeklyBonus.objects.filter(
+        user_id=user_id, week_start=week_start, week_end=week_end)
+    started = time.monotonic()
+    updated = bonus.update(
+        weekly_balance=new_balance,
+        weekly_reward=weekly_reward_expression(new_balance),
     )
-    current = Decimal(bonus.weekly_balance)
-    bonus.weekly_balance = (current + Decimal(delta)
-                            ).quantize(Decimal("0.000001"))
+    WEEKLY_DELTA_LOCK_WAIT_SECONDS.observe(time.monotonic() - started)
+    if updated:
+        return
 
-    bonus.calculate_reward()
-    bonus.save(update_fields=["weekly_balance", "weekly_reward"])
+    try:
+        with transaction.atomic():
+            created = WeeklyBonus(
+                user_id=user_id, week_start=week_start, week_end=week_end,
+                weekly_balance=delta)
+            created.calculate_reward()
+            created.save()
+    except IntegrityError:
+        # Lost the race to create the row; it exists now
+        bonus.update(
+            weekly_balance=new_balance,
+            weekly_reward=weekly_reward_expression(new_balance),
+        )
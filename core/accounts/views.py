@@ -2,15 +2,24 @@ import logging
 from rest_framework import status, viewsets, permissions
 from rest_framework.views import APIView
 from rest_framework.response import Response
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
 from rest_framework.decorators import action
+from rest_framework_simplejwt.authentication import JWTStatelessUserAuthentication
 from django.db import transaction
-from django.core.mail import send_mail
-from django.conf import settings
 
+from authentication.models import AdminEvent
 from authentication.services import EmailService
-from .models import Lay, DepositRotation, DepositAddress, WeeklyBonus
-from .serializers import LaySerializer, WithdrawRequestSerializer, LayCreateSerializer, WeeklyBonusSerializer
+from core.metrics import WITHDRAW_REQUESTS
+from core.money import from_micros, to_micros
+from . import wallet
+from .conditional import conditional_account_get
+from .deposits import next_deposit_address
+from .models import Lay, LayImage, WeeklyBonus
+from .pagination import LayCursorPagination
+from .serializers import LaySerializer, LaySettlementSerializer, WithdrawRequestSerializer, LayCreateSerializer, WeeklyBonusSerializer
+from .settlement import settle_lays
+from .summary import current_weekly_bonus, get_account_summary
+from .uploads import discard_spooled, lay_image_fields, schedule_lay_upload, spool_upload
 from .utils import get_week_range
 
 
@@ -20,45 +29,52 @@ logger = logging.getLogger(__name__)
 class AccountInfoView(APIView):
     permission_classes = [IsAuthenticated]
 
+    @conditional_account_get
     def get(self, request):
-        # try:
-        user = request.user
-        lays = Lay.objects.filter(user=user).order_by('-created_at')
-        weekly_bonus = WeeklyBonus.objects.filter(user=user).last()
-
-        return Response({
-            "balance": user.balance,
-            "weekly_cashback": user.weekly_cashback,
-            "active_lay": LaySerializer(lays, many=True).data,
-            "weekly_bonus": WeeklyBonusSerializer(weekly_bonus).data,
-            "email": request.user.email
-        })
-        # except Exception:
-        #     return Response(
-        #         {"detail": "Unexpected server error happend!"},
-        #         status=500
-        #     )
+        return Response(
+            get_account_summary(request.user, request.account_version))
 
 
-class GenerateDepositAddressView(APIView):
+class LayListView(APIView):
+    """Cursor-paginated lay history, newest first."""
+    # Only the user id is needed, so the user is built from the token claims
+    authentication_classes = [JWTStatelessUserAuthentication]
     permission_classes = [IsAuthenticated]
+    pagination_class = LayCursorPagination
 
+    @conditional_account_get
     def get(self, request):
-        try:
-            with transaction.atomic():
-                rotation = DepositRotation.objects.select_for_update().first()
-                address = DepositAddress.objects.get(
-                    index=rotation.current_index)
-                max_index = (
-                    DepositAddress.objects.order_by('-index')
-                    .values_list('index', flat=True)
-                    .first()
-                )
-                rotation.current_index = 1 if rotation.current_index >= max_index else rotation.current_index + 1
+        paginator = self.pagination_class()
+        lays = paginator.paginate_queryset(
+            Lay.objects.filter(user_id=request.user.pk), request, view=self)
+        return paginator.get_paginated_response(
+            LaySerializer(lays, many=True).data)
+
+
+class LaySettlementView(APIView):
+    """Staff-only bulk settlement: { "ids": [...], "status": "approved" }"""
+    permission_classes = [IsAdminUser]
+
+    def post(self, request):
+        serializer = LaySettlementSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response({"detail": serializer.errors}, status=status.HTTP_400_BAD_REQUEST)
+
+        data = serializer.validated_data
+        result = settle_lays(
+            Lay.objects.filter(pk__in=data["ids"]), data["status"])
+        logger.info(
+            f"{request.user.email} settled {result.settled} lays as {data['status']}")
+        return Response({"settled": result.settled, "users": result.users})
 
-                rotation.save()
 
-            return Response({"address": address.address})
+class GenerateDepositAddressView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        try:
+            address = next_deposit_address()
+            return Response({"address": address})
         except Exception as e:
             logger.exception("Error generating deposit address")
             return Response(
@@ -81,16 +97,15 @@ class WithdrawRequestView(APIView):
                 return Response({"detail": "Data is not valid!"}, status=status.HTTP_400_BAD_REQUEST)
 
             withdraw_request = serializer.save(user=request.user)
+            WITHDRAW_REQUESTS.inc()
 
             logger.info(
-                f"Withdraw requested by user {request.user.email} for amount {withdraw_request.amount}")
+                f"Withdraw requested by user {request.user.email} for amount {from_micros(withdraw_request.amount)}")
 
-            send_mail(
+            EmailService.notify_admin_email(
                 subject="New Withdraw Request",
-                message=f"User {request.user.email} requested withdrawal of {withdraw_request.amount} to address {withdraw_request.address}.",
-                from_email=settings.DEFAULT_FROM_EMAIL,
-                recipient_list=[settings.DEFAULT_FROM_EMAIL]
-            )
+                message=f"User {request.user.email} requested withdrawal of {from_micros(withdraw_request.amount)} to address {withdraw_request.address}.",
+                event_type=AdminEvent.WITHDRAW_REQUESTED)
 
             return Response({"detail": "We received your request! We will get back to you shortly!"}, status=status.HTTP_200_OK)
 
@@ -112,37 +127,50 @@ class CalculatorView(APIView):
         user = request.user
         data = serializer.validated_data
 
-        with transaction.atomic():
-            lay = Lay.objects.create(
-                user=user,
-                total_odds=data['total_odd'],
-                stake_amount=data['stake_amount'],
-                win_payout=data['win_payout'],
-                file_name=data['file'].name,
-                match=data['match'],
-                tip=data['tip'],
-                loss_payout=data['loss_payout'],
-            )
-            lay.file.save(data['file'].name, data['file'])
-            lay.file_name = data['file'].name
-            lay.save()
+        # Local disk write only; storage upload happens after commit
+        spool_path, digest = spool_upload(data['file'])
+        # Known content is linked to the existing image, nothing is uploaded
+        known_image = LayImage.objects.filter(sha256=digest).first()
+        if known_image:
+            discard_spooled(spool_path)
+            image_fields = lay_image_fields(known_image)
+        else:
+            image_fields = {"spool_path": spool_path}
 
-            user.balance -= data['stake_amount']
-            user.save(update_fields=["balance"])
+        try:
+            with transaction.atomic():
+                # Conditional in-database debit; no lock on the user row
+                user.balance = wallet.debit(user.pk, data['stake_amount'])
+                lay = Lay.objects.create(
+                    user=user,
+                    total_odds=data['total_odd'],
+                    stake_amount=data['stake_amount'],
+                    win_payout=data['win_payout'],
+                    file_name=data['file'].name,
+                    match=data['match'],
+                    tip=data['tip'],
+                    loss_payout=data['loss_payout'],
+                    **image_fields,
+                )
+                if not known_image:
+                    schedule_lay_upload(lay.pk, digest)
+        except wallet.InsufficientFunds:
+            discard_spooled(spool_path)
+            return Response({"detail": {"detail": ["Amount exceeds your current balance."]}}, status=400)
+        except Exception:
+            discard_spooled(spool_path)
+            raise
 
         logger.info(f"Lay created by {user.email}")
 
         try:
-            send_mail(
+            EmailService.notify_admin_email(
                 subject="New Lay Submission",
-                message=f"User {user.email} submitted a lay with odds {data['total_odd']} and stake {data['stake_amount']}.",
-                from_email=settings.DEFAULT_FROM_EMAIL,
-                recipient_list=[settings.DEFAULT_FROM_EMAIL],
-                fail_silently=False,
-            )
+                message=f"User {user.email} submitted a lay with odds {data['total_odd']} and stake {from_micros(data['stake_amount'])}.",
+                event_type=AdminEvent.LAY_SUBMITTED)
         except Exception as e:
             logger.exception(
-                "Failed to send admin notification email for new lay")
+                "Failed to queue admin notification email for new lay")
 
         return Response({}, status=200)
 
@@ -152,17 +180,18 @@ class WeeklyBonusViewSet(viewsets.ModelViewSet):
     permission_classes = [permissions.IsAuthenticated]
 
     def get_queryset(self):
-        return WeeklyBonus.objects.filter(user=self.request.user)
+        return WeeklyBonus.objects.filter(
+            user=self.request.user).order_by("-week_start")
+
+    @conditional_account_get
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
 
     @action(detail=False, methods=["get"])
+    @conditional_account_get
     def current(self, request):
-        """Get or create current week’s record"""
-        start, end = get_week_range()
-        bonus, _ = WeeklyBonus.objects.get_or_create(
-            user=request.user, week_start=start, week_end=end
-        )
-        bonus.calculate_reward()
-        bonus.save()
+        """Current week’s record, without writing (see current_weekly_bonus)"""
+        bonus = current_weekly_bonus(request.user)
         return Response(self.get_serializer(bonus).data)
 
     @action(detail=False, methods=["post"])
@@ -177,7 +206,7 @@ class WeeklyBonusViewSet(viewsets.ModelViewSet):
         )
 
         result = request.data.get("result")
-        amount = float(request.data.get("amount", 0))
+        amount = to_micros(request.data.get("amount", 0))
 
         if result == "ok":
             bonus.weekly_balance += amount  # Win payout
@@ -202,7 +231,8 @@ class DepositClickViewView(APIView):
         try:
             EmailService.notify_admin_email(
                 subject="Deposit Clicked",
-                message=f"User {request.user.email} clicked the copy deposit button. Address: {address}")
+                message=f"User {request.user.email} clicked the copy deposit button. Address: {address}",
+                event_type=AdminEvent.DEPOSIT_CLICKED)
 
             return Response({"detail": "Deposity copy"}, status=200)
         except Exception as e:
@@ -0,0 +1,67 @@
+"""
+Wallet (CustomUser.balance) mutations. Every change is a single UPDATE that
+does the arithmetic in the database and returns the new balance, so callers
+never read-modify-write the balance or lock the user row. Amounts are
+integer micros (see `core.money`).
+"""
+from django.db import connection
+
+from authentication.models import CustomUser as User
+from core.money import to_float
+from .caching import invalidate_account
+from .events import publish
+
+
+class InsufficientFunds(Exception):
+    pass
+
+
+def _update_balance(sql, params):
+    table = connection.ops.quote_name(User._meta.db_table)
+    with connection.cursor() as cursor:
+        cursor.execute(sql.format(table=table), params)
+        row = cursor.fetchone()
+    return row[0] if row else None
+
+
+def debit(user_id, amount):
+    """
+    Take `amount` from the wallet only if it covers it. Returns the new
+    balance or raises InsufficientFunds, leaving the balance untouched.
+    """
+    balance = _update_balance(
+        "UPDATE {table} SET balance = balance - %s "
+        "WHERE id = %s AND balance >= %s RETURNING balance",
+        [amount, user_id, amount],
+    )
+    if balance is None:
+        raise InsufficientFunds(f"Balance of user {user_id} does not cover {amount}")
+    invalidate_account(user_id)
+    publish(user_id, "balance", balance_event(balance))
+    return balance
+
+
+def adjust(user_id, delta, notify=True):
+    """
+    Unconditionally add `delta` (which may be negative). Returns the new
+    balance. Bulk callers pass notify=False and publish the balance events
+    together.
+    """
+    balance = _update_balance(
+        "UPDATE {table} SET balance = balance + %s WHERE id = %s RETURNING balance",
+        [delta, user_id],
+    )
+    if balance is None:
+        raise User.DoesNotExist(f"User {user_id} does not exist")
+    invalidate_account(user_id)
+    if notify:
+        publish(user_id, "balance", balance_event(balance))
+    return balance
+
+
+def credit(user_id, amount):
+    return adjust(user_id, amount)
+
+
+def balance_event(balance):
+    return {"balance": to_float(balance)}
@@ -1,16 +1,22 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
 from django.utils.translation import gettext_lazy as _
-from .models import CustomUser
+
+from core.money import money_display
+from core.db_router import ReplicaChangeListMixin
+from .models import CustomUser, OutboundEmail
 
 @admin.register(CustomUser)
-class CustomUserAdmin(BaseUserAdmin):
+class CustomUserAdmin(ReplicaChangeListMixin, BaseUserAdmin):
     model = CustomUser
-    list_display = ('email', 'is_active', 'is_staff', 'balance', 'weekly_cashback')
+    list_display = ('email', 'is_active', 'is_staff', 'wallet_balance', 'cashback')
     list_filter = ('is_active', 'is_staff')
     ordering = ('email',)
     search_fields = ('email',)
 
+    wallet_balance = money_display('balance')
+    cashback = money_display('weekly_cashback')
+
     fieldsets = (
         (None, {'fields': ('email', 'password')}),
         (_('Personal info'), {'fields': ('balance', 'weekly_cashback')}),
@@ -23,4 +29,11 @@ class CustomUserAdmin(BaseUserAdmin):
             'classes': ('wide',),
             'fields': ('email', 'password1', 'password2', 'is_active', 'is_staff'),
         }),
-    )
\ No newline at end of file
+    )
+
+@admin.register(OutboundEmail)
+class OutboundEmailAdmin(ReplicaChangeListMixin, admin.ModelAdmin):
+    list_display = ('subject', 'status', 'attempts', 'next_attempt_at', 'created_at', 'sent_at')
+    list_filter = ('status',)
+    search_fields = ('subject',)
+    readonly_fields = ('created_at', 'sent_at', 'last_error')
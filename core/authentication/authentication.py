@@ -0,0 +1,67 @@
+import copy
+import threading
+
+from cachetools import TTLCache
+from django.conf import settings
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+from accounts.caching import account_version
+
+_users = None
+_users_lock = threading.Lock()
+
+
+def _user_cache():
+    global _users
+    if _users is None:
+        _users = TTLCache(maxsize=settings.AUTH_USER_CACHE_SIZE,
+                          ttl=settings.AUTH_USER_CACHE_TTL)
+    return _users
+
+
+def clear_user_cache():
+    with _users_lock:
+        _user_cache().clear()
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication that keeps recently seen users in a short-TTL,
+    per-worker cache instead of fetching the row on every request.
+
+    Entries are tagged with the user's account version (accounts.caching).
+    Every CustomUser save, wallet movement and settlement bumps that
+    version, so a cached row is never served after it changed. Each request
+    gets its own copy, so views may modify `request.user` freely.
+    """
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification")) from None
+
+        # Read the version before the row, so a change racing the fetch
+        # leaves the entry tagged with the older version
+        version = account_version(user_id)
+        with _users_lock:
+            entry = _user_cache().get(user_id)
+        if entry is None or entry[0] != version:
+            user = super().get_user(validated_token)
+            with _users_lock:
+                _user_cache()[user_id] = (version, user)
+            return copy.copy(user)
+
+        user = copy.copy(entry[1])
+        # Same checks JWTAuthentication runs on a freshly fetched row
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        if api_settings.CHECK_REVOKE_TOKEN and validated_token.get(
+                api_settings.REVOKE_TOKEN_CLAIM) != get_md5_hash_password(user.password):
+            raise AuthenticationFailed(
+                _("The user's password has been changed."), code="password_changed")
+        return user
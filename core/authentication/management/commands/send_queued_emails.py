@@ -0,0 +1,40 @@
+import time
+
+from django.conf import settings
+from django.core.mail import get_connection
+from django.core.management.base import BaseCommand
+
+from authentication.services import AdminDigest, EmailOutbox
+
+
+class Command(BaseCommand):
+    help = "Flush due admin digests and deliver queued emails over one SMTP connection"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size", type=int, default=settings.EMAIL_OUTBOX_BATCH_SIZE)
+        parser.add_argument(
+            "--loop", action="store_true",
+            help="Keep polling the outbox instead of exiting once it is drained")
+        parser.add_argument(
+            "--interval", type=float, default=5.0,
+            help="Seconds to sleep between polls when the outbox is empty")
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        connection = get_connection()
+        try:
+            while True:
+                AdminDigest.flush()
+                sent, failed = EmailOutbox.deliver_batch(connection, batch_size)
+                if sent or failed:
+                    self.stdout.write(f"Sent {sent}, failed {failed}")
+                if sent + failed >= batch_size:
+                    continue
+                if not options["loop"]:
+                    break
+                # Idle: don't keep the SMTP session open while sleeping
+                connection.close()
+                time.sleep(options["interval"])
+        finally:
+            connection.close()
@@ -0,0 +1,51 @@
+# Generated by Django 5.2.1 on 2026-10-18 18:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("authentication", "0003_outboundemail"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="AdminNotification",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "event_type",
+                    models.CharField(
+                        choices=[
+                            ("user_registered", "User registered"),
+                            ("lay_submitted", "Lay submitted"),
+                            ("deposit_clicked", "Deposit clicked"),
+                            ("withdraw_requested", "Withdraw requested"),
+                        ],
+                        max_length=50,
+                    ),
+                ),
+                ("subject", models.CharField(max_length=255)),
+                ("message", models.TextField()),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("digested_at", models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["digested_at", "created_at"],
+                        name="admin_notif_pending_idx",
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,43 @@
+from django.db import migrations, models
+from django.db.models import F, Value
+from django.db.models.functions import Round
+
+MICROS = 1_000_000
+FIELDS = ["balance", "weekly_cashback"]
+
+
+def to_micros(apps, schema_editor):
+    CustomUser = apps.get_model("authentication", "CustomUser")
+    CustomUser.objects.update(**{name: Round(F(name) * MICROS) for name in FIELDS})
+
+
+def from_micros(apps, schema_editor):
+    CustomUser = apps.get_model("authentication", "CustomUser")
+    CustomUser.objects.update(
+        **{name: F(name) / Value(float(MICROS)) for name in FIELDS}
+    )
+
+
+class Migration(migrations.Migration):
+    """
+    Wallet amounts move from floats to integer micro-units. The columns are
+    widened to numeric(20, 6) first so the scaling is exact.
+    """
+
+    dependencies = [
+        ("authentication", "0004_adminnotification"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="customuser",
+            name="balance",
+            field=models.DecimalField(decimal_places=6, default=0, max_digits=20),
+        ),
+        migrations.AlterField(
+            model_name="customuser",
+            name="weekly_cashback",
+            field=models.DecimalField(decimal_places=6, default=0, max_digits=20),
+        ),
+        migrations.RunPython(to_micros, from_micros),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.1 on 2026-10-18 19:02
+
+import core.money
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("authentication", "0005_money_to_micros"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="customuser",
+            name="balance",
+            field=core.money.MoneyField(default=0),
+        ),
+        migrations.AlterField(
+            model_name="customuser",
+            name="weekly_cashback",
+            field=core.money.MoneyField(default=0),
+        ),
+    ]
@@ -0,0 +1,37 @@
+from django.db import migrations
+
+INDEX = "customuser_email_trgm_idx"
+
+
+def create_index(apps, schema_editor):
+    # Trigram indexes are PostgreSQL only; elsewhere search scans the table
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    table = apps.get_model("authentication", "CustomUser")._meta.db_table
+    schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    # Matches the UPPER(...) LIKE that icontains compiles to
+    schema_editor.execute(
+        f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {INDEX} "
+        f"ON {schema_editor.quote_name(table)} USING gin (UPPER(email) gin_trgm_ops)"
+    )
+
+
+def drop_index(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {INDEX}")
+
+
+class Migration(migrations.Migration):
+    """
+    Admin searches users by email with icontains, which a B-tree cannot
+    serve; a trigram index can. Built concurrently, outside a transaction.
+    """
+    atomic = False
+
+    dependencies = [
+        ("authentication", "0006_money_fields"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_index, drop_index),
+    ]
@@ -1,6 +1,9 @@
 # authentication/models.py
 from django.contrib.auth.models import AbstractBaseUser, PermissionsMixin, BaseUserManager
 from django.db import models
+from django.utils import timezone
+
+from core.money import MoneyField
 
 class CustomUserManager(BaseUserManager):
     def create_user(self, email, password=None, **extra_fields):
@@ -20,8 +23,8 @@ class CustomUserManager(BaseUserManager):
 
 class CustomUser(AbstractBaseUser, PermissionsMixin):
     email = models.EmailField(unique=True)
-    balance = models.FloatField(default=0.0)
-    weekly_cashback = models.FloatField(default=0.0)
+    balance = MoneyField(default=0)
+    weekly_cashback = MoneyField(default=0)
     is_active = models.BooleanField(default=False)
     is_staff = models.BooleanField(default=False)
 
@@ -32,3 +35,64 @@ class CustomUser(AbstractBaseUser, PermissionsMixin):
 
     def __str__(self):
         return self.email
+
+
+class OutboundEmailStatus(models.TextChoices):
+    PENDING = "pending", "Pending"
+    SENT = "sent", "Sent"
+    FAILED = "failed", "Failed"
+
+
+class OutboundEmail(models.Model):
+    """
+    Durable outbox row. Request handlers only insert here; the
+    `send_queued_emails` worker delivers them over SMTP.
+    """
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    from_email = models.CharField(max_length=255)
+    recipients = models.JSONField(default=list)
+    status = models.CharField(
+        max_length=20,
+        choices=OutboundEmailStatus.choices,
+        default=OutboundEmailStatus.PENDING,
+    )
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True, default="")
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["status", "next_attempt_at"],
+                         name="outbox_due_idx"),
+        ]
+
+    def __str__(self):
+        return f'{self.subject} -> {", ".join(self.recipients)}'
+
+
+class AdminEvent(models.TextChoices):
+    USER_REGISTERED = "user_registered", "User registered"
+    LAY_SUBMITTED = "lay_submitted", "Lay submitted"
+    DEPOSIT_CLICKED = "deposit_clicked", "Deposit clicked"
+    WITHDRAW_REQUESTED = "withdraw_requested", "Withdraw requested"
+
+
+class AdminNotification(models.Model):
+    """Admin event waiting to be rolled into the next digest email."""
+    event_type = models.CharField(max_length=50, choices=AdminEvent.choices)
+    subject = models.CharField(max_length=255)
+    message = models.TextField()
+    created_at = models.DateTimeField(auto_now_add=True)
+    digested_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["digested_at", "created_at"],
+                         name="admin_notif_pending_idx"),
+        ]
+
+    def __str__(self):
+        return f'{self.event_type}: {self.subject}'
@@ -1,44 +1,193 @@
 # authentication/utils.py
-from django.core.mail import send_mail
+import logging
+from datetime import timedelta
+
+from django.core.mail import EmailMessage
 from django.contrib.auth.tokens import default_token_generator
+from django.db import transaction
+from django.utils import timezone
 from django.utils.http import urlsafe_base64_encode
 from django.utils.encoding import force_bytes
 from django.conf import settings
 
+from core.instrumentation import track_io
+from .models import AdminEvent, AdminNotification, OutboundEmail, OutboundEmailStatus
+
+
+logger = logging.getLogger(__name__)
+
 
 class EmailService:
+    """
+    All outbound mail goes through the outbox table. Nothing here talks to
+    SMTP; the `send_queued_emails` command delivers the queued rows.
+    """
+
+    @staticmethod
+    def enqueue(subject, message, recipient_list, from_email=None):
+        return OutboundEmail.objects.create(
+            subject=subject,
+            body=message,
+            from_email=from_email or settings.DEFAULT_FROM_EMAIL,
+            recipients=list(recipient_list),
+        )
 
     def send_activation_email(user, request):
         uid = urlsafe_base64_encode(force_bytes(user.pk))
         token = default_token_generator.make_token(user)
         verify_url = f"{settings.FRONTEND_URL}/auth/verify?uid={uid}&token={token}"
         message = f"Click the link to verify your email: {verify_url}"
-        send_mail(
+        EmailService.enqueue(
             "Verify your account",
             message,
-            settings.DEFAULT_FROM_EMAIL,
             [user.email],
-            fail_silently=False,
         )
 
     @staticmethod
     def send_password_reset_email(email, reset_url):
 
         message = f"Click the link below to reset your password:\n{reset_url}"
-        send_mail(
+        EmailService.enqueue(
             "Reset Your Password",
             message,
-            settings.DEFAULT_FROM_EMAIL,
             [email],
-            fail_silently=False,
         )
 
     @staticmethod
-    def notify_admin_email(subject, message):
-        send_mail(
-            subject,
-            message,
-            settings.DEFAULT_FROM_EMAIL,
-            [settings.DEFAULT_FROM_EMAIL],
-            fail_silently=False,
-        )
+    def notify_admin_email(subject, message, event_type=None):
+        """
+        Untyped notifications and event types listed in
+        ADMIN_NOTIFY_IMMEDIATE_EVENTS are queued as their own email; every
+        other event waits for the next `AdminDigest.flush`.
+        """
+        if event_type is None or event_type in settings.ADMIN_NOTIFY_IMMEDIATE_EVENTS:
+            EmailService.enqueue(
+                subject,
+                message,
+                [settings.DEFAULT_FROM_EMAIL],
+            )
+            return
+        AdminNotification.objects.create(
+            event_type=event_type, subject=subject, message=message)
+
+
+class AdminDigest:
+    """Rolls buffered admin events into a single email per digest window."""
+
+    @staticmethod
+    def flush(force=False):
+        """
+        Queue one digest email once the oldest buffered event is older than
+        ADMIN_DIGEST_WINDOW_SECONDS (or right away with `force`). Returns the
+        number of events included.
+        """
+        window = timedelta(seconds=settings.ADMIN_DIGEST_WINDOW_SECONDS)
+
+        with transaction.atomic():
+            pending = list(
+                AdminNotification.objects.select_for_update(skip_locked=True)
+                .filter(digested_at__isnull=True)
+                .order_by("created_at")
+            )
+            if not pending:
+                return 0
+            if not force and pending[0].created_at > timezone.now() - window:
+                return 0
+
+            by_type = {}
+            for event in pending:
+                by_type.setdefault(event.event_type, []).append(event)
+
+            sections = []
+            for event_type, events in by_type.items():
+                lines = [
+                    f"- {e.created_at:%Y-%m-%d %H:%M:%S} {e.message}" for e in events]
+                sections.append(
+                    f"{AdminEvent(event_type).label} ({len(events)})\n" + "\n".join(lines))
+
+            summary = ", ".join(
+                f"{len(events)} {AdminEvent(event_type).label.lower()}"
+                for event_type, events in by_type.items())
+            EmailService.enqueue(
+                f"Admin digest: {summary}",
+                "\n\n".join(sections),
+                [settings.DEFAULT_FROM_EMAIL],
+            )
+            AdminNotification.objects.filter(
+                pk__in=[e.pk for e in pending]).update(digested_at=timezone.now())
+
+        return len(pending)
+
+
+class EmailOutbox:
+    """Delivers queued `OutboundEmail` rows over a caller-owned SMTP connection."""
+
+    @staticmethod
+    def retry_delay(attempts):
+        base = settings.EMAIL_OUTBOX_RETRY_BASE_SECONDS
+        return timedelta(seconds=min(base * 2 ** (attempts - 1),
+                                     settings.EMAIL_OUTBOX_RETRY_MAX_SECONDS))
+
+    @staticmethod
+    def claim(batch_size):
+        """
+        Lease up to `batch_size` due emails to this worker: the attempt is
+        counted and `next_attempt_at` pushed past EMAIL_OUTBOX_LEASE_SECONDS
+        in one short transaction, so other workers skip them meanwhile. A
+        worker that dies mid-batch only delays its unsent rows until the
+        lease ends; it does not roll back the ones it already sent.
+        """
+        with transaction.atomic():
+            batch = list(
+                OutboundEmail.objects.select_for_update(skip_locked=True)
+                .filter(status=OutboundEmailStatus.PENDING,
+                        next_attempt_at__lte=timezone.now())
+                .order_by("next_attempt_at")[:batch_size]
+            )
+            lease_until = timezone.now() + timedelta(
+                seconds=settings.EMAIL_OUTBOX_LEASE_SECONDS)
+            for email in batch:
+                email.attempts += 1
+                email.next_attempt_at = lease_until
+            OutboundEmail.objects.bulk_update(batch, ["attempts", "next_attempt_at"])
+        return batch
+
+    @staticmethod
+    def deliver_batch(connection, batch_size=None):
+        """
+        Send up to `batch_size` due emails. Returns (sent, failed) counts.
+
+        Rows are claimed first (see `claim`) and sent outside any
+        transaction; each result is recorded as soon as it is known.
+        """
+        batch = EmailOutbox.claim(batch_size or settings.EMAIL_OUTBOX_BATCH_SIZE)
+        sent = failed = 0
+
+        for email in batch:
+            message = EmailMessage(
+                email.subject, email.body, email.from_email,
+                email.recipients, connection=connection)
+            try:
+                # No-op while the session is up, so the batch shares it
+                with track_io("smtp"):
+                    connection.open()
+                    message.send()
+            except Exception as exc:
+                # Drop the (possibly broken) session; next send reconnects
+                connection.close()
+                failed += 1
+                result = {"last_error": str(exc)}
+                if email.attempts >= settings.EMAIL_OUTBOX_MAX_ATTEMPTS:
+                    result["status"] = OutboundEmailStatus.FAILED
+                    logger.error("Giving up on email %s after %s attempts",
+                                 email.pk, email.attempts)
+                else:
+                    result["next_attempt_at"] = (
+                        timezone.now() + EmailOutbox.retry_delay(email.attempts))
+            else:
+                sent += 1
+                result = {"status": OutboundEmailStatus.SENT,
+                          "sent_at": timezone.now(), "last_error": ""}
+            OutboundEmail.objects.filter(pk=email.pk).update(**result)
+
+        return sent, failed
@@ -1,3 +1,152 @@
-from django.test import TestCase
+from unittest import mock
 
-# Create your tests here.
+import pytest
+from django.core import mail
+from django.core.mail import get_connection
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from accounts import wallet
+from core.money import to_micros
+from .models import (
+    AdminEvent, AdminNotification, CustomUser, OutboundEmail, OutboundEmailStatus)
+from .services import AdminDigest, EmailOutbox, EmailService
+
+
+@pytest.mark.django_db
+def test_notify_admin_email_is_queued_not_sent():
+    EmailService.notify_admin_email(
+        "Withdraw", "someone withdrew", event_type=AdminEvent.WITHDRAW_REQUESTED)
+
+    assert len(mail.outbox) == 0
+    queued = OutboundEmail.objects.get()
+    assert queued.status == OutboundEmailStatus.PENDING
+    assert queued.subject == "Withdraw"
+
+
+@pytest.mark.django_db
+def test_deliver_batch_sends_queued_emails():
+    for i in range(3):
+        EmailService.enqueue(f"Subject {i}", "body", ["user@example.com"])
+
+    sent, failed = EmailOutbox.deliver_batch(get_connection())
+
+    assert (sent, failed) == (3, 0)
+    assert len(mail.outbox) == 3
+    assert not OutboundEmail.objects.filter(status=OutboundEmailStatus.PENDING).exists()
+
+
+@pytest.mark.django_db
+def test_deliver_batch_backs_off_on_smtp_error(settings):
+    settings.EMAIL_OUTBOX_MAX_ATTEMPTS = 2
+    queued = EmailService.enqueue("Subject", "body", ["user@example.com"])
+    connection = get_connection()
+
+    with mock.patch.object(connection, "send_messages", side_effect=OSError("down")):
+        assert EmailOutbox.deliver_batch(connection) == (0, 1)
+        queued.refresh_from_db()
+        assert queued.status == OutboundEmailStatus.PENDING
+        assert queued.last_error == "down"
+
+        # Not due yet, so the next pass leaves it alone
+        assert EmailOutbox.deliver_batch(connection) == (0, 0)
+
+        OutboundEmail.objects.update(next_attempt_at=queued.created_at)
+        assert EmailOutbox.deliver_batch(connection) == (0, 1)
+
+    queued.refresh_from_db()
+    assert queued.status == OutboundEmailStatus.FAILED
+
+
+@pytest.mark.django_db
+def test_sent_emails_are_recorded_before_a_later_send_fails():
+    first = EmailService.enqueue("First", "body", ["user@example.com"])
+    second = EmailService.enqueue("Second", "body", ["user@example.com"])
+    connection = get_connection()
+    send = connection.send_messages
+
+    def send_then_die(messages):
+        if messages[0].subject == "Second":
+            raise KeyboardInterrupt  # the worker is killed mid-batch
+        return send(messages)
+
+    with mock.patch.object(connection, "send_messages", side_effect=send_then_die):
+        with pytest.raises(KeyboardInterrupt):
+            EmailOutbox.deliver_batch(connection)
+
+    first.refresh_from_db()
+    second.refresh_from_db()
+    assert first.status == OutboundEmailStatus.SENT
+    # Still leased, so no other worker sends it until the lease ends
+    assert second.status == OutboundEmailStatus.PENDING
+    assert EmailOutbox.deliver_batch(connection) == (0, 0)
+    assert len(mail.outbox) == 1
+
+
+@pytest.mark.django_db
+def test_admin_events_are_coalesced_into_one_digest():
+    for i in range(5):
+        EmailService.notify_admin_email(
+            "Deposit Clicked", f"click {i}", event_type=AdminEvent.DEPOSIT_CLICKED)
+    EmailService.notify_admin_email(
+        "New User Registered", "new user", event_type=AdminEvent.USER_REGISTERED)
+
+    assert not OutboundEmail.objects.exists()
+    # Window has not elapsed yet
+    assert AdminDigest.flush() == 0
+
+    assert AdminDigest.flush(force=True) == 6
+    digest = OutboundEmail.objects.get()
+    assert "5 deposit clicked" in digest.subject
+    assert "click 4" in digest.body
+    assert not AdminNotification.objects.filter(digested_at__isnull=True).exists()
+
+
+@pytest.fixture
+def token_client(db):
+    user = CustomUser.objects.create_user(
+        email="token@example.com", password="pass1234", balance=to_micros(50),
+        is_active=True)
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(user)}")
+    return client, user
+
+
+def _user_queries(queries):
+    return [q for q in queries if "authentication_customuser" in q["sql"]]
+
+
+def test_lay_feed_authenticates_from_token_claims(token_client):
+    client, _ = token_client
+
+    with CaptureQueriesContext(connection) as ctx:
+        res = client.get("/api/v1/account/lays/")
+
+    assert res.status_code == 200
+    assert _user_queries(ctx.captured_queries) == []
+
+
+def test_cached_user_skips_the_row_fetch(token_client):
+    client, _ = token_client
+    assert client.get("/api/v1/account/info/").status_code == 200
+
+    with CaptureQueriesContext(connection) as ctx:
+        res = client.get("/api/v1/account/info/")
+
+    assert res.status_code == 200
+    assert len(ctx.captured_queries) == 0
+
+
+def test_cached_user_is_refreshed_after_changes(token_client):
+    client, user = token_client
+    assert client.get("/api/v1/account/info/").data["balance"] == 50
+
+    wallet.credit(user.pk, to_micros(25))
+    assert client.get("/api/v1/account/info/").data["balance"] == 75
+
+    user.refresh_from_db()
+    user.is_active = False
+    user.save()
+    assert client.get("/api/v1/account/info/").status_code == 401
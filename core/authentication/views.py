@@ -16,7 +16,7 @@ from .serializers import (
     ResetPasswordSerializer
 )
 from .services import EmailService
-from .models import CustomUser
+from .models import AdminEvent, CustomUser
 
 
 class RegisterView(APIView):
@@ -32,7 +32,8 @@ class RegisterView(APIView):
                 user=user, week_start=week_start, week_end=week_end
             )
             EmailService.notify_admin_email(
-                "New User Registered", f"User {user.email} has registered.")
+                "New User Registered", f"User {user.email} has registered.",
+                event_type=AdminEvent.USER_REGISTERED)
             EmailService.send_activation_email(user, request)
             return Response({"detail": "Registration successful! Please verify your email."}, status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
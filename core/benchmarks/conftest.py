@@ -0,0 +1,300 @@
+"""
+Opt-in API benchmark suite.
+
+Skipped unless RUN_BENCHMARKS is set. Seeds the test database once per
+session at production-like volumes (scaled down through BENCH_USERS,
+BENCH_LAYS and BENCH_WEEKS), then measures query counts, p50/p95 latency
+and peak Python memory per scenario against `baselines.json`.
+
+    RUN_BENCHMARKS=1 pytest core/benchmarks
+    RUN_BENCHMARKS=1 BENCH_UPDATE_BASELINES=1 pytest core/benchmarks
+
+The seeded rows stay in the test database for the whole session, so while
+benchmarks run every other test is skipped.
+
+Query counts are compared exactly. Latency and memory are compared with
+BENCH_TOLERANCE (default 25%) headroom, timings with at least BENCH_SLACK_MS
+(default 5) so scheduler noise on millisecond requests does not fail them,
+and a scenario that only regressed on timings is measured again before it
+fails. They are machine specific, so re-record the baselines on the reference environment when it changes. A
+scenario missing any of the four baseline numbers fails.
+"""
+import datetime
+import json
+import os
+import random
+import statistics
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+import pytest
+from django.contrib.auth.hashers import make_password
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from accounts.models import (
+    DepositAddress, DepositRotation, Lay, LayStatus, WeeklyBonus)
+from core.money import to_micros
+from accounts.utils import get_week_range
+from authentication.models import CustomUser
+from .helpers import BENCH_PASSWORD
+
+BASELINES_PATH = Path(__file__).with_name("baselines.json")
+SEED_BATCH_SIZE = 10_000
+
+
+def _env_int(name, default):
+    return int(os.environ.get(name, default))
+
+
+def _env_float(name, default):
+    return float(os.environ.get(name, default))
+
+
+def pytest_collection_modifyitems(config, items):
+    benchmarking = bool(os.environ.get("RUN_BENCHMARKS"))
+    skip = pytest.mark.skip(
+        reason="benchmarks run on their own seeded database" if benchmarking
+        else "set RUN_BENCHMARKS=1 to run benchmarks")
+    for item in items:
+        if bool(item.get_closest_marker("benchmark")) != benchmarking:
+            item.add_marker(skip)
+
+
+@contextmanager
+def _explicit_timestamps(model, field_name="created_at"):
+    """Let bulk_create keep the seeded created_at instead of auto_now_add."""
+    field = model._meta.get_field(field_name)
+    field.auto_now_add = False
+    try:
+        yield
+    finally:
+        field.auto_now_add = True
+
+
+def seed(users, lays, weeks):
+    rng = random.Random(42)
+    password = make_password(BENCH_PASSWORD)
+    now = timezone.now()
+    current_start, current_end = get_week_range(now.date())
+
+    CustomUser.objects.bulk_create(
+        (CustomUser(email=f"bench{i}@example.com", password=password,
+                    is_active=True, balance=to_micros(1_000_000))
+         for i in range(users)),
+        batch_size=SEED_BATCH_SIZE,
+    )
+    user_ids = list(
+        CustomUser.objects.filter(email__startswith="bench")
+        .order_by("pk").values_list("pk", flat=True))
+
+    statuses = [LayStatus.APPROVED, LayStatus.DECLINED, LayStatus.PENDING]
+    span = datetime.timedelta(weeks=weeks).total_seconds()
+    with _explicit_timestamps(Lay):
+        for start in range(0, lays, SEED_BATCH_SIZE):
+            Lay.objects.bulk_create([
+                Lay(user_id=user_ids[i % len(user_ids)], total_odds=2.5,
+                    stake_amount=to_micros(10), win_payout=to_micros(25),
+                    loss_payout=to_micros(1), file_name="slip.jpg",
+                    file="lays/slip.jpg", status=rng.choice(statuses),
+                    created_at=now - datetime.timedelta(
+                        seconds=span * i / lays))
+                for i in range(start, min(start + SEED_BATCH_SIZE, lays))
+            ])
+
+    bonuses = (
+        WeeklyBonus(
+            user_id=user_id,
+            week_start=current_start - datetime.timedelta(weeks=w),
+            week_end=current_end - datetime.timedelta(weeks=w),
+            weekly_balance=to_micros(rng.randint(-100, 100)) if w < 2 else 0,
+        )
+        for user_id in user_ids for w in range(weeks)
+    )
+    batch = []
+    for bonus in bonuses:
+        bonus.calculate_reward()
+        batch.append(bonus)
+        if len(batch) == SEED_BATCH_SIZE:
+            WeeklyBonus.objects.bulk_create(batch)
+            batch = []
+    WeeklyBonus.objects.bulk_create(batch)
+
+    DepositAddress.objects.bulk_create(
+        DepositAddress(address=f"bench-deposit-{i}", index=i)
+        for i in range(1, 11))
+    DepositRotation.objects.create(current_index=1)
+
+    with connection.cursor() as cursor:
+        cursor.execute("ANALYZE")
+    return user_ids
+
+
+@pytest.fixture(scope="session")
+def bench_data(django_db_setup, django_db_blocker):
+    with django_db_blocker.unblock():
+        user_ids = seed(
+            users=_env_int("BENCH_USERS", 10_000),
+            lays=_env_int("BENCH_LAYS", 1_000_000),
+            weeks=_env_int("BENCH_WEEKS", 52),
+        )
+    return user_ids
+
+
+@pytest.fixture
+def bench_user(db, bench_data):
+    return CustomUser.objects.get(pk=bench_data[0])
+
+
+@pytest.fixture
+def bench_client(bench_user):
+    """Client sending a real Bearer token, so authentication is measured too."""
+    client = APIClient()
+    token = RefreshToken.for_user(bench_user).access_token
+    client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+    return client
+
+
+@dataclass
+class Measurement:
+    queries: int
+    p50_ms: float
+    p95_ms: float
+    peak_kb: float
+
+
+class BenchmarkRecorder:
+    """Runs scenarios and compares them with the stored baselines."""
+
+    def __init__(self, baselines, runs, tolerance, slack_ms, update):
+        self.baselines = baselines
+        self.runs = runs
+        self.tolerance = tolerance
+        self.slack_ms = slack_ms
+        self.update = update
+        self.results = {}
+
+    def _once(self, fn, setup, rollback, traced=False):
+        """One iteration: (elapsed ms, query count, peak bytes or 0)."""
+        with transaction.atomic() if rollback else nullcontext():
+            args = (setup() if setup else None) or ()
+            if traced:
+                tracemalloc.start()
+            try:
+                with CaptureQueriesContext(connection) as captured:
+                    started = time.perf_counter()
+                    fn(*args)
+                    elapsed = (time.perf_counter() - started) * 1000
+                peak = tracemalloc.get_traced_memory()[1] if traced else 0
+            finally:
+                if traced:
+                    tracemalloc.stop()
+            if rollback:
+                transaction.set_rollback(True)
+        return elapsed, len(captured), peak
+
+    def measure(self, name, fn, setup=None, rollback=False, runs=None):
+        """
+        Time `fn` over `runs` iterations (after one warm-up), then run it
+        once more under tracemalloc for peak memory.
+
+        `setup` runs before each iteration, outside the measurement, and
+        may return a tuple of arguments for `fn`. With `rollback` each iteration runs
+        in a rolled-back savepoint, so every iteration sees the same data.
+
+        A scenario that only regressed on timings is measured once more and
+        fails only if it regresses again, so one scheduler stall does not
+        fail it.
+        """
+        measurement = self._sample(fn, setup, rollback, runs or self.runs)
+        regressions = self.regressions(name, measurement)
+        if regressions and all(r.split()[0].endswith("_ms") for r in regressions):
+            measurement = self._sample(fn, setup, rollback, runs or self.runs)
+            regressions = self.regressions(name, measurement)
+        self.results[name] = measurement
+        if regressions:
+            pytest.fail(f"{name} regressed: " + "; ".join(regressions))
+        return measurement
+
+    def _sample(self, fn, setup, rollback, runs):
+        self._once(fn, setup, rollback)
+
+        timings = []
+        queries = 0
+        for _ in range(runs):
+            elapsed, count, _ = self._once(fn, setup, rollback)
+            timings.append(elapsed)
+            queries = max(queries, count)
+        _, _, peak = self._once(fn, setup, rollback, traced=True)
+
+        if len(timings) > 1:
+            cuts = statistics.quantiles(timings, n=100, method="inclusive")
+            p50, p95 = cuts[49], cuts[94]
+        else:
+            p50 = p95 = timings[0]
+        return Measurement(
+            queries=queries, p50_ms=round(p50, 2), p95_ms=round(p95, 2),
+            peak_kb=round(peak / 1024, 1))
+
+    def regressions(self, name, measurement):
+        """How `measurement` is worse than the baseline of `name`, as messages."""
+        if self.update:
+            return []
+        baseline = self.baselines.get(name)
+        if baseline is None:
+            pytest.fail(f"No baseline for {name!r}; run with BENCH_UPDATE_BASELINES=1")
+
+        missing = [metric for metric in asdict(measurement) if metric not in baseline]
+        if missing:
+            pytest.fail(f"Baseline for {name!r} has no {', '.join(missing)}; "
+                        "run with BENCH_UPDATE_BASELINES=1")
+
+        regressions = []
+        if measurement.queries > baseline["queries"]:
+            regressions.append(
+                f"queries {measurement.queries} > {baseline['queries']}")
+        for metric in ("p50_ms", "p95_ms", "peak_kb"):
+            limit = baseline[metric]
+            value = getattr(measurement, metric)
+            allowed = limit * (1 + self.tolerance)
+            if metric.endswith("_ms"):
+                allowed = max(allowed, limit + self.slack_ms)
+            if value > allowed:
+                regressions.append(f"{metric} {value} > {limit} (allowed {allowed:.2f})")
+        return regressions
+
+    def save(self):
+        merged = {**self.baselines,
+                  **{name: asdict(m) for name, m in self.results.items()}}
+        BASELINES_PATH.write_text(json.dumps(merged, indent=2, sort_keys=True) + "\n")
+
+
+@pytest.fixture(scope="session")
+def benchmark_recorder():
+    baselines = (json.loads(BASELINES_PATH.read_text())
+                 if BASELINES_PATH.exists() else {})
+    recorder = BenchmarkRecorder(
+        baselines,
+        runs=_env_int("BENCH_RUNS", 20),
+        tolerance=_env_float("BENCH_TOLERANCE", 0.25),
+        slack_ms=_env_float("BENCH_SLACK_MS", 5),
+        update=bool(os.environ.get("BENCH_UPDATE_BASELINES")),
+    )
+    yield recorder
+    if recorder.update and recorder.results:
+        recorder.save()
+
+
+@pytest.fixture
+def bench(benchmark_recorder, bench_data, db, settings, tmp_path):
+    settings.LAY_UPLOAD_SPOOL_DIR = str(tmp_path / "spool")
+    settings.MEDIA_ROOT = str(tmp_path / "media")
+    cache.clear()
+    return benchmark_recorder
@@ -0,0 +1,21 @@
+import io
+
+from PIL import Image
+
+BENCH_PASSWORD = "bench-pass-1234"
+
+
+def request(method, path, status=200, **kwargs):
+    """Scenario calling `method(path, **kwargs)` and checking the status."""
+    def run(*_):
+        response = method(path, **kwargs)
+        assert response.status_code == status, response.content
+    return run
+
+
+def slip_image():
+    buffer = io.BytesIO()
+    Image.new("RGB", (1200, 800), "white").save(buffer, format="JPEG")
+    buffer.seek(0)
+    buffer.name = "slip.jpg"
+    return buffer
@@ -0,0 +1,93 @@
+import pytest
+from django.core.cache import cache
+from rest_framework.test import APIClient
+
+from accounts.models import Lay, LayStatus
+from accounts.pagination import LayCursorPagination
+from authentication.models import CustomUser
+
+from .helpers import request, slip_image
+
+pytestmark = pytest.mark.benchmark
+
+
+def test_account_info_cold(bench, bench_client):
+    bench.measure(
+        "account_info_cold",
+        request(bench_client.get, "/api/v1/account/info/"),
+        setup=cache.clear)
+
+
+def test_account_info_cached(bench, bench_client):
+    bench.measure(
+        "account_info_cached", request(bench_client.get, "/api/v1/account/info/"))
+
+
+def test_lay_feed_first_page(bench, bench_client):
+    bench.measure(
+        "lay_feed_first_page", request(bench_client.get, "/api/v1/account/lays/"))
+
+
+def test_lay_feed_deep_page(bench, bench_client, bench_user):
+    lays = Lay.objects.filter(user=bench_user).order_by("-created_at", "-id")
+    deep = lays[max(lays.count() - 20, 0)]
+    cursor = LayCursorPagination().encode_cursor(deep)
+    bench.measure(
+        "lay_feed_deep_page",
+        request(bench_client.get, "/api/v1/account/lays/", data={"cursor": cursor}),
+        setup=cache.clear)
+
+
+def test_lay_bulk_settlement(bench, bench_data):
+    staff = CustomUser.objects.create_user(
+        email="bench-staff@example.com", password="pass1234", is_staff=True)
+    client = APIClient()
+    client.force_authenticate(user=staff)
+    ids = [
+        str(pk) for pk in Lay.objects.filter(status=LayStatus.PENDING)
+        .order_by("-created_at").values_list("pk", flat=True)[:500]
+    ]
+    bench.measure(
+        "lay_bulk_settlement",
+        request(client.post, "/api/v1/account/lays/settle/",
+                data={"ids": ids, "status": LayStatus.APPROVED}, format="json"),
+        rollback=True)
+
+
+def test_deposit_generate(bench, bench_client):
+    bench.measure(
+        "deposit_generate",
+        request(bench_client.get, "/api/v1/account/deposit/generate/"),
+        rollback=True)
+
+
+def test_deposit_click(bench, bench_client):
+    bench.measure(
+        "deposit_click",
+        request(bench_client.post, "/api/v1/account/deposit-click/",
+                data={"address": "bench-deposit-1"}, format="json"),
+        rollback=True)
+
+
+def test_withdraw_request(bench, bench_client):
+    bench.measure(
+        "withdraw_request",
+        request(bench_client.post, "/api/v1/account/withdraw/",
+                data={"amount": 5, "address": "bench-withdraw"}, format="json"),
+        rollback=True)
+
+
+def test_calculator_submit(bench, bench_client):
+    payload = {
+        "total_odd": 2.5, "stake_amount": 10, "win_payout": 25,
+        "loss_payout": "1", "tip": "Over 2.5", "match": "A vs B",
+    }
+
+    def submit(image):
+        response = bench_client.post(
+            "/api/v1/account/calculator/", {**payload, "file": image},
+            format="multipart")
+        assert response.status_code == 200, response.content
+
+    bench.measure(
+        "calculator_submit", submit, setup=lambda: (slip_image(),), rollback=True)
@@ -0,0 +1,89 @@
+import pytest
+from django.contrib.auth.tokens import default_token_generator
+from django.utils.encoding import force_bytes
+from django.utils.http import urlsafe_base64_encode
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from authentication.models import CustomUser
+
+from .helpers import BENCH_PASSWORD, request
+
+pytestmark = pytest.mark.benchmark
+
+
+def test_register(bench, bench_data):
+    client = APIClient()
+    bench.measure(
+        "auth_register",
+        request(client.post, "/api/v1/auth/register/", status=201, data={
+            "email": "newcomer@example.com", "password": "pass12345",
+            "confirm_password": "pass12345",
+        }, format="json"),
+        rollback=True)
+
+
+def test_verify_email(bench, bench_data):
+    client = APIClient()
+    user = CustomUser.objects.create_user(
+        email="unverified@example.com", password="pass12345")
+    uid = urlsafe_base64_encode(force_bytes(user.pk))
+
+    def verify(token):
+        response = client.post(
+            "/api/v1/auth/verify/email/", {"uid": uid, "token": token},
+            format="json")
+        assert response.status_code == 200, response.content
+
+    bench.measure(
+        "auth_verify_email", verify,
+        setup=lambda: (default_token_generator.make_token(user),),
+        rollback=True)
+
+
+def test_login(bench, bench_user):
+    client = APIClient()
+    bench.measure(
+        "auth_login",
+        request(client.post, "/api/v1/auth/login/", data={
+            "email": bench_user.email, "password": BENCH_PASSWORD,
+        }, format="json"),
+        runs=5)
+
+
+def test_logout(bench, bench_user, bench_client):
+    def logout(refresh):
+        response = bench_client.post(
+            "/api/v1/auth/logout/", {"refresh": refresh}, format="json")
+        assert response.status_code == 205, response.content
+
+    bench.measure(
+        "auth_logout", logout,
+        setup=lambda: (str(RefreshToken.for_user(bench_user)),),
+        rollback=True)
+
+
+def test_request_password_reset(bench, bench_user):
+    client = APIClient()
+    bench.measure(
+        "auth_request_reset",
+        request(client.post, "/api/v1/auth/request-reset/password/",
+                data={"email": bench_user.email}, format="json"),
+        rollback=True)
+
+
+def test_reset_password(bench, bench_user):
+    client = APIClient()
+    uid = urlsafe_base64_encode(force_bytes(bench_user.pk))
+
+    def reset(token):
+        response = client.post("/api/v1/auth/reset/password/", {
+            "uid": uid, "token": token,
+            "password": BENCH_PASSWORD, "confirm_password": BENCH_PASSWORD,
+        }, format="json")
+        assert response.status_code == 200, response.content
+
+    bench.measure(
+        "auth_reset_password", reset,
+        setup=lambda: (default_token_generator.make_token(bench_user),),
+        rollback=True, runs=5)
@@ -0,0 +1,13 @@
+import pytest
+
+from accounts.cron import reset_weekly_bonuses
+
+pytestmark = pytest.mark.benchmark
+
+
+def test_reset_weekly_bonuses(bench, bench_data):
+    def settle():
+        result = reset_weekly_bonuses()
+        assert not result.already_settled
+
+    bench.measure("cron_reset_weekly_bonuses", settle, rollback=True, runs=3)
@@ -0,0 +1,19 @@
+import pytest
+
+from authentication.authentication import clear_user_cache
+
+
+@pytest.fixture(autouse=True)
+def isolated_cache(settings, tmp_path):
+    """
+    Each test gets its own empty file cache, whatever CACHE_BACKEND says:
+    version keys, summaries and primary pins left by other tests (or runs)
+    would otherwise match reused user pks.
+    """
+    settings.CACHES = {"default": {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": str(tmp_path / "cache"),
+    }}
+    clear_user_cache()
+    yield
+    clear_user_cache()
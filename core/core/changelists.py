@@ -0,0 +1,122 @@
+"""
+Admin changelists for tables too large to COUNT(*) or scan on every page.
+
+`LargeTableAdminMixin` pages with `EstimatedCountPaginator`, loads only
+the columns the list shows and, with `user__email` among the search fields,
+looks the matching users up before searching the table itself.
+"""
+import json
+
+from django.contrib.admin.views.main import ChangeList
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils.functional import cached_property
+from django.utils.text import smart_split, unescape_string_literal
+
+USER_EMAIL = "user__email"
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Takes the row count of an unfiltered list from the planner statistics
+    (pg_class.reltuples) instead of counting the table. Filtered lists are
+    counted up to `exact_count_limit`; past that the planner's estimate of
+    the filtered query is used. Exact everywhere but on PostgreSQL, and for
+    small tables. Only the page links depend on the count, and the last
+    pages of an estimate may be empty.
+    """
+    exact_count_limit = 10_000
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        if connections[queryset.db].vendor != "postgresql":
+            return super().count
+        if not queryset.query.where:
+            estimate = self._table_estimate(queryset)
+            return estimate if estimate > self.exact_count_limit else super().count
+        counted = queryset[:self.exact_count_limit + 1].count()
+        if counted <= self.exact_count_limit:
+            return counted
+        return max(counted, self._plan_estimate(queryset))
+
+    @staticmethod
+    def _table_estimate(queryset):
+        # -1 (or 0) until the table is first analyzed
+        with connections[queryset.db].cursor() as cursor:
+            cursor.execute(
+                "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+                [queryset.model._meta.db_table],
+            )
+            row = cursor.fetchone()
+        return row[0] if row else -1
+
+    @staticmethod
+    def _plan_estimate(queryset):
+        sql, params = queryset.order_by().query.sql_with_params()
+        with connections[queryset.db].cursor() as cursor:
+            cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+            plan = cursor.fetchone()[0]
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
+
+
+class PrunedChangeList(ChangeList):
+
+    def get_results(self, request):
+        # Only the result page is pruned; actions get the full rows
+        if self.model_admin.list_only:
+            self.queryset = self.queryset.only(*self.model_admin.list_only)
+        super().get_results(request)
+
+
+class LargeTableAdminMixin:
+    """
+    ModelAdmin mixin for large tables. Set `list_only` to the columns
+    `list_display` reads (with `list_select_related` for related ones).
+    """
+    paginator = EstimatedCountPaginator
+    # Skips the "N total" link, a second count of the whole table
+    show_full_result_count = False
+    list_only = ()
+    # Past this many matching users, search them with a join instead
+    user_search_limit = 1000
+
+    def get_changelist(self, request, **kwargs):
+        return PrunedChangeList
+
+    def get_search_fields(self, request):
+        # With other fields to search, user__email is handled below
+        fields = tuple(super().get_search_fields(request))
+        return tuple(f for f in fields if f != USER_EMAIL) or fields
+
+    def get_search_results(self, request, queryset, search_term):
+        """
+        OR-ing a joined users column with this table's columns makes the
+        database read both tables whole. So for each word of the search
+        (split like ModelAdmin does), the users whose email matches are
+        found first (trigram index on the email), and this table is
+        searched for their ids or the other fields, each on its own index.
+        As in ModelAdmin, every word has to match some field.
+        """
+        if (USER_EMAIL not in self.search_fields
+                # Searched with the join: it is the only field
+                or USER_EMAIL in self.get_search_fields(request)):
+            return super().get_search_results(request, queryset, search_term)
+
+        may_have_duplicates = False
+        for bit in smart_split(search_term):
+            # Quoted phrases go to ModelAdmin as they are, to stay one word
+            matched, duplicates = super().get_search_results(request, queryset, bit)
+            may_have_duplicates |= duplicates
+            if bit.startswith(("\"", "'")) and bit[0] == bit[-1]:
+                bit = unescape_string_literal(bit)
+            queryset = matched | queryset.filter(user__in=self._users_matching(bit))
+        return queryset, may_have_duplicates
+
+    def _users_matching(self, word):
+        users = self.model._meta.get_field("user").related_model.objects.filter(
+            email__icontains=word)
+        user_ids = list(users.values_list("pk", flat=True)[:self.user_search_limit + 1])
+        return users if len(user_ids) > self.user_search_limit else user_ids
@@ -0,0 +1,162 @@
+"""
+Primary/replica routing for the "replica" alias (see settings).
+
+Everything uses the primary unless it runs in a `replica_reads()` block and a
+replica is configured. Inside such a block reads go to the replica, except:
+
+- in a transaction, and once the request has written anything, so code sees
+  its own writes;
+- for a user who wrote within the last REPLICA_PIN_SECONDS (pinned by
+  `PrimaryPinMiddleware`), or when the data being read changed that
+  recently, since the replica may not have caught up yet.
+"""
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import DEFAULT_DB_ALIAS, connections
+
+REPLICA = "replica"
+
+_state = ContextVar("db_routing", default=None)
+
+
+@dataclass
+class RoutingState:
+    replica: bool = False
+    wrote: bool = False
+
+
+def replica_configured():
+    return REPLICA in settings.DATABASES
+
+
+def _pin_key(user_id):
+    return f"db:primary_pin:{user_id}"
+
+
+def pin_to_primary(user_id):
+    cache.set(_pin_key(user_id), True, settings.REPLICA_PIN_SECONDS)
+
+
+def is_pinned(user_id):
+    return cache.get(_pin_key(user_id)) is not None
+
+
+@contextmanager
+def replica_reads(user_id=None, changed_at=None):
+    """
+    Send the enclosed block's reads to the replica, unless `user_id` is
+    pinned to the primary or `changed_at` (Unix time of the last change to
+    the data read) is within REPLICA_PIN_SECONDS.
+    """
+    state = _state.get()
+    token = None
+    if state is None:
+        state = RoutingState()
+        token = _state.set(state)
+    previous = state.replica
+    state.replica = (
+        replica_configured()
+        and (changed_at is None
+             or time.time() - changed_at >= settings.REPLICA_PIN_SECONDS)
+        and not (user_id is not None and is_pinned(user_id))
+    )
+    try:
+        yield
+    finally:
+        state.replica = previous
+        if token is not None:
+            _state.reset(token)
+
+
+@contextmanager
+def track_writes():
+    """Yield the RoutingState of the enclosed block; `wrote` is set by any write."""
+    state = RoutingState()
+    token = _state.set(state)
+    try:
+        yield state
+    finally:
+        _state.reset(token)
+
+
+class PrimaryReplicaRouter:
+
+    def db_for_read(self, model, **hints):
+        state = _state.get()
+        if (state is None or not state.replica or state.wrote
+                or connections[DEFAULT_DB_ALIAS].in_atomic_block):
+            return DEFAULT_DB_ALIAS
+        return REPLICA
+
+    def db_for_write(self, model, **hints):
+        state = _state.get()
+        if state is not None:
+            state.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # The replica holds the same rows as the primary
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == DEFAULT_DB_ALIAS
+
+
+class PrimaryPinMiddleware:
+    """
+    Pins a user who wrote during the request to the primary for
+    REPLICA_PIN_SECONDS, so their next pages show what they just did.
+    Not loaded when no replica is configured.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not replica_configured():
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        with track_writes() as state:
+            response = self.get_response(request)
+        if state.wrote:
+            self.pin(request)
+        return response
+
+    async def __acall__(self, request):
+        with track_writes() as state:
+            response = await self.get_response(request)
+        if state.wrote:
+            await sync_to_async(self.pin)(request)
+        return response
+
+    @staticmethod
+    def pin(request):
+        user = getattr(request, "user", None)
+        if user is not None and user.is_authenticated:
+            pin_to_primary(user.pk)
+
+
+class ReplicaChangeListMixin:
+    """ModelAdmin mixin serving changelist pages from the replica."""
+
+    def changelist_view(self, request, extra_context=None):
+        if request.method != "GET":
+            return super().changelist_view(request, extra_context)
+        with replica_reads(user_id=request.user.pk):
+            response = super().changelist_view(request, extra_context)
+            # The result page is only queried while the template renders
+            if hasattr(response, "render"):
+                response.render()
+        return response
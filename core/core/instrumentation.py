@@ -0,0 +1,122 @@
+"""
+Per-request metrics collection. The request middleware opens a
+`RequestMetrics` scope in a context variable; database wrappers, the
+instrumented cache backends and `track_io` add to it. Outside a request
+(management commands, background threads) everything here is a no-op.
+"""
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from functools import cache
+
+from django.core.cache import caches
+
+_current = ContextVar("request_metrics", default=None)
+
+
+@dataclass
+class RequestMetrics:
+    trace: bool = False
+    trace_limit: int = 0
+    db_queries: int = 0
+    db_ms: float = 0.0
+    cache_hits: int = 0
+    cache_misses: int = 0
+    cache_ms: float = 0.0
+    io_ms: dict = field(default_factory=dict)
+    queries: list = field(default_factory=list)
+
+
+def current_metrics():
+    return _current.get()
+
+
+@contextmanager
+def collect_metrics(trace=False, trace_limit=0):
+    """Collect metrics for the enclosed block and yield the RequestMetrics."""
+    metrics = RequestMetrics(trace=trace, trace_limit=trace_limit)
+    token = _current.set(metrics)
+    try:
+        yield metrics
+    finally:
+        _current.reset(token)
+
+
+def db_execute_wrapper(execute, sql, params, many, context):
+    """`connection.execute_wrapper` hook counting and timing queries."""
+    metrics = _current.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        elapsed = (time.perf_counter() - started) * 1000
+        metrics.db_queries += 1
+        metrics.db_ms += elapsed
+        if metrics.trace and len(metrics.queries) < metrics.trace_limit:
+            metrics.queries.append((round(elapsed, 2), sql))
+
+
+@contextmanager
+def track_io(kind):
+    """Attribute the enclosed block's wall time to external I/O of `kind`."""
+    metrics = _current.get()
+    if metrics is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = (time.perf_counter() - started) * 1000
+        metrics.io_ms[kind] = metrics.io_ms.get(kind, 0.0) + elapsed
+
+
+_MISSING = object()
+
+
+class InstrumentedCacheMixin:
+    """Counts hits and misses of `get` (and of `get_many`, which uses it)."""
+
+    def get(self, key, default=None, version=None):
+        metrics = _current.get()
+        if metrics is None:
+            return super().get(key, default, version)
+        started = time.perf_counter()
+        value = super().get(key, _MISSING, version)
+        metrics.cache_ms += (time.perf_counter() - started) * 1000
+        if value is _MISSING:
+            metrics.cache_misses += 1
+            return default
+        metrics.cache_hits += 1
+        return value
+
+
+@cache
+def _instrumented_class(backend_class):
+    return type(f"Instrumented{backend_class.__name__}",
+                (InstrumentedCacheMixin, backend_class), {})
+
+
+def instrument_caches():
+    """
+    Have every cache backend, whichever CACHES configures, count its hits
+    and misses: each backend instance is created as a subclass of its
+    configured class with InstrumentedCacheMixin. Idempotent.
+    """
+    if getattr(caches, "instrumented", False):
+        return
+    create_connection = caches.create_connection
+
+    def instrument(backend):
+        if not isinstance(backend, InstrumentedCacheMixin):
+            backend.__class__ = _instrumented_class(type(backend))
+        return backend
+
+    caches.create_connection = lambda alias: instrument(create_connection(alias))
+    caches.instrumented = True
+    # Backends this thread created before
+    for backend in caches.all(initialized_only=True):
+        instrument(backend)
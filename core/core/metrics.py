@@ -0,0 +1,31 @@
+"""
+Prometheus metrics for the API processes.
+
+Counters and histograms live in prometheus_client's default registry. When
+PROMETHEUS_MULTIPROC_DIR is set (see gunicorn.conf.py) their values are
+kept in per-process mmap files, so `/metrics` (core.views) aggregates every
+gunicorn worker no matter which one serves the scrape.
+
+Models import this module, so it must not import Django apps or DRF.
+"""
+from prometheus_client import Counter, Histogram
+
+LAYS_CREATED = Counter(
+    "lays_created_total", "Lays submitted, by initial status", ["status"])
+LAYS_SETTLED = Counter(
+    "lays_settled_total", "Lay status changes, by new status", ["status"])
+SETTLEMENT_SECONDS = Histogram(
+    "settlement_duration_seconds", "Duration of settlement runs", ["kind"],
+    buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120))
+WEEKLY_DELTA_LOCK_WAIT_SECONDS = Histogram(
+    "weekly_delta_lock_wait_seconds",
+    "Time in the in-place WeeklyBonus UPDATE; under contention this is "
+    "dominated by waiting for the row lock",
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1))
+DEPOSIT_ADDRESSES_SERVED = Counter(
+    "deposit_addresses_served_total", "Deposit addresses handed out by the rotation")
+WITHDRAW_REQUESTS = Counter(
+    "withdraw_requests_total", "Withdraw requests accepted")
+REQUEST_LATENCY_SECONDS = Histogram(
+    "http_request_duration_seconds", "Request wall time, by route",
+    ["route", "method", "status"])
@@ -0,0 +1,110 @@
+import logging
+import random
+import time
+from contextlib import ExitStack
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import connections
+
+from .instrumentation import collect_metrics, db_execute_wrapper, instrument_caches
+from .metrics import REQUEST_LATENCY_SECONDS
+
+logger = logging.getLogger("core.requests")
+
+
+class RequestMetricsMiddleware:
+    """
+    Records DB query count and time, cache hits/misses, external I/O time
+    and total wall time for every request. They are returned in a
+    `Server-Timing` header and logged as one key=value line.
+
+    Full SQL is kept only for a REQUEST_TRACE_SAMPLE_RATE share of requests
+    and logged when such a request is slower than REQUEST_SLOW_MS, so the
+    common path is a few counters per query.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+        instrument_caches()
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        trace = random.random() < settings.REQUEST_TRACE_SAMPLE_RATE
+        started = time.perf_counter()
+        with collect_metrics(trace, settings.REQUEST_TRACE_MAX_QUERIES) as metrics:
+            with self.wrap_connections(ExitStack()):
+                response = self.get_response(request)
+        self.finish(request, response, metrics, started)
+        return response
+
+    async def __acall__(self, request):
+        trace = random.random() < settings.REQUEST_TRACE_SAMPLE_RATE
+        started = time.perf_counter()
+        with collect_metrics(trace, settings.REQUEST_TRACE_MAX_QUERIES) as metrics:
+            # Async views query through sync_to_async, in the request's
+            # worker thread, whose connections are not this thread's
+            stack = await sync_to_async(self.wrap_connections)(ExitStack())
+            try:
+                response = await self.get_response(request)
+            finally:
+                await sync_to_async(stack.close)()
+        self.finish(request, response, metrics, started)
+        return response
+
+    @staticmethod
+    def wrap_connections(stack):
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(db_execute_wrapper))
+        return stack
+
+    def finish(self, request, response, metrics, started):
+        total_ms = (time.perf_counter() - started) * 1000
+        if settings.REQUEST_SERVER_TIMING:
+            response["Server-Timing"] = self.server_timing(metrics, total_ms)
+        self.log(request, response, metrics, total_ms)
+        match = request.resolver_match
+        REQUEST_LATENCY_SECONDS.labels(
+            route=match.route if match else "unmatched",
+            method=request.method,
+            status=response.status_code,
+        ).observe(total_ms / 1000)
+
+    @staticmethod
+    def server_timing(metrics, total_ms):
+        entries = [
+            f'db;dur={metrics.db_ms:.1f};desc="{metrics.db_queries} queries"',
+            f'cache;dur={metrics.cache_ms:.1f};'
+            f'desc="{metrics.cache_hits} hit/{metrics.cache_misses} miss"',
+        ]
+        entries += [f"{kind};dur={ms:.1f}" for kind, ms in metrics.io_ms.items()]
+        entries.append(f"total;dur={total_ms:.1f}")
+        return ", ".join(entries)
+
+    @staticmethod
+    def log(request, response, metrics, total_ms):
+        fields = {
+            "method": request.method,
+            "path": request.path,
+            "status": response.status_code,
+            "total_ms": round(total_ms, 1),
+            "db_queries": metrics.db_queries,
+            "db_ms": round(metrics.db_ms, 1),
+            "cache_hits": metrics.cache_hits,
+            "cache_misses": metrics.cache_misses,
+            **{f"{kind}_ms": round(ms, 1) for kind, ms in metrics.io_ms.items()},
+        }
+        logger.info(" ".join(f"{key}={value}" for key, value in fields.items()),
+                    extra={"request_metrics": fields})
+
+        if metrics.trace and total_ms >= settings.REQUEST_SLOW_MS:
+            lines = [f"{ms:>8.2f}ms  {sql}" for ms, sql in metrics.queries]
+            logger.warning(
+                "Slow request %s %s took %.1fms, %s queries:\n%s",
+                request.method, request.path, total_ms, metrics.db_queries,
+                "\n".join(lines), extra={"request_metrics": fields})
@@ -0,0 +1,104 @@
+"""
+Money is stored as integer micro-units (1 unit = 1_000_000 micros) in
+BIGINT columns, so sums and balance arithmetic stay exact in SQL and in
+Python. Conversion to and from decimals happens only at the edges: API
+serializers and admin forms.
+"""
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+
+from django import forms
+from django.contrib import admin
+from django.db import models
+from rest_framework import serializers
+
+MICROS = 1_000_000
+_QUANTUM = Decimal("0.000001")
+
+
+def to_micros(value):
+    """Decimal/str/float/int amount in units -> int micros. Blank is 0."""
+    if value is None or value == "":
+        return 0
+    try:
+        amount = Decimal(str(value).strip())
+    except InvalidOperation:
+        raise ValueError(f"Invalid amount: {value!r}") from None
+    if not amount.is_finite():
+        raise ValueError(f"Invalid amount: {value!r}")
+    return int((amount * MICROS).to_integral_value(rounding=ROUND_HALF_UP))
+
+
+def from_micros(micros):
+    """int micros -> Decimal units with 6 decimal places."""
+    return (Decimal(micros or 0) / MICROS).quantize(_QUANTUM)
+
+
+def to_float(micros):
+    return float(from_micros(micros))
+
+
+def money_display(field_name, description=None):
+    """Admin `list_display` column showing a micro-unit field in units."""
+    @admin.display(
+        description=description or field_name.replace("_", " "),
+        ordering=field_name,
+    )
+    def column(model_admin, obj):
+        return from_micros(getattr(obj, field_name))
+    return column
+
+
+class MoneyFormField(forms.DecimalField):
+    """Admin/form input in units, cleaned to int micros."""
+
+    def __init__(self, **kwargs):
+        kwargs.setdefault("decimal_places", 6)
+        kwargs.pop("max_value", None)
+        kwargs.pop("min_value", None)
+        super().__init__(**kwargs)
+
+    def prepare_value(self, value):
+        if isinstance(value, int):
+            return from_micros(value)
+        return value
+
+    def clean(self, value):
+        value = super().clean(value)
+        return None if value is None else to_micros(value)
+
+    def has_changed(self, initial, data):
+        try:
+            return initial != to_micros(data)
+        except ValueError:
+            return True
+
+
+class MoneyField(models.BigIntegerField):
+    """BIGINT column holding micro-units; edited in units through forms."""
+
+    def formfield(self, **kwargs):
+        return super().formfield(**{"form_class": MoneyFormField, **kwargs})
+
+
+class MoneySerializerField(serializers.Field):
+    """
+    API representation of a micro-unit amount. Reads numbers or numeric
+    strings; writes a float, or a 6-decimal string with `as_string=True`.
+    """
+    default_error_messages = {"invalid": "A valid amount is required."}
+
+    def __init__(self, as_string=False, **kwargs):
+        self.as_string = as_string
+        super().__init__(**kwargs)
+
+    def to_internal_value(self, data):
+        if isinstance(data, bool):
+            self.fail("invalid")
+        try:
+            return to_micros(data)
+        except ValueError:
+            self.fail("invalid")
+
+    def to_representation(self, value):
+        amount = from_micros(value)
+        return str(amount) if self.as_string else float(amount)
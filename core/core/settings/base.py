@@ -31,6 +31,9 @@ DEBUG = False  # overridden in dev.py
 
 ALLOWED_HOSTS = os.environ.get("ALLOWED_HOSTS", "").split(",")
 
+# Verification and password reset emails link here
+FRONTEND_URL = config("FRONTEND_URL", "http://localhost:5173")
+
 LANGUAGE_CODE = "en-us"
 TIME_ZONE = "Europe/Paris"
 USE_I18N = True
@@ -69,6 +72,7 @@ INSTALLED_APPS = DJANGO_APPS + THIRD_PARTY_APPS + LOCAL_APPS
 # Middleware
 # -----------------------------------------------------------------------------
 MIDDLEWARE = [
+    "core.middleware.RequestMetricsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
@@ -77,6 +81,7 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "core.db_router.PrimaryPinMiddleware",
 ]
 
 # -----------------------------------------------------------------------------
@@ -107,12 +112,24 @@ STATIC_ROOT = BASE_DIR / "staticfiles"
 MEDIA_URL = "/media/"
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Lay screenshots are spooled here by the request and pushed to storage by a
+# per-process worker pool (accounts.uploads). `push_lay_uploads` retries from
+# here too, so it must run where this directory is (a volume every web host
+# and the retry job mount, if there are several hosts)
+LAY_UPLOAD_SPOOL_DIR = config("LAY_UPLOAD_SPOOL_DIR", default=str(BASE_DIR / "spool"))
+LAY_UPLOAD_WORKERS = 2
+# Uploads are re-encoded as JPEG, bounded to these sizes (px, longest side)
+LAY_IMAGE_MAX_DIMENSION = 1600
+LAY_IMAGE_PREVIEW_DIMENSION = 800
+LAY_IMAGE_THUMBNAIL_DIMENSION = 200
+LAY_IMAGE_QUALITY = 82
+
 # -----------------------------------------------------------------------------
 # REST Framework & JWT
 # -----------------------------------------------------------------------------
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "authentication.authentication.CachedJWTAuthentication",
     ),
     "DEFAULT_PERMISSION_CLASSES": (
         "rest_framework.permissions.IsAuthenticated",
@@ -134,6 +151,46 @@ AUTHENTICATION_BACKENDS = [
     'django.contrib.auth.backends.ModelBackend',
 ]
 
+# -----------------------------------------------------------------------------
+# Cache – version keys bumped in one process (deposit pool, account summaries,
+# replica pins) must be seen by every other, so all web processes have to
+# share it. "file" is shared only by the processes of one host: fine for a
+# single machine, wrong for several dynos. "database" and "redis" (REDIS_URL)
+# are shared by all of them; "database" needs `manage.py createcachetable`.
+# -----------------------------------------------------------------------------
+CACHE_BACKEND = config("CACHE_BACKEND", default="file")
+# Past this the file and database backends cull a share of the entries
+# (version keys included) on every write
+CACHE_MAX_ENTRIES = config("CACHE_MAX_ENTRIES", default=100_000, cast=int)
+
+
+def cache_settings(backend):
+    # Any backend reports hits/misses to the request metrics
+    # (core.instrumentation.instrument_caches)
+    if backend == "redis":
+        return {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": config("REDIS_URL", default="redis://localhost:6379/0"),
+        }
+    if backend == "database":
+        return {
+            "BACKEND": "django.core.cache.backends.db.DatabaseCache",
+            "LOCATION": "django_cache",
+            "OPTIONS": {"MAX_ENTRIES": CACHE_MAX_ENTRIES},
+        }
+    if backend == "file":
+        return {
+            "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+            "LOCATION": config("CACHE_DIR", default=str(BASE_DIR / ".django_cache")),
+            "OPTIONS": {"MAX_ENTRIES": CACHE_MAX_ENTRIES},
+        }
+    raise ValueError(f"Unknown CACHE_BACKEND {backend!r}")
+
+
+CACHES = {"default": cache_settings(CACHE_BACKEND)}
+# Safety net only: summaries are invalidated by version bumps on every write
+ACCOUNT_SUMMARY_CACHE_TIMEOUT = 5 * 60
+
 # -----------------------------------------------------------------------------
 # Google Cloud Storage credentials helper
 # -----------------------------------------------------------------------------
@@ -175,6 +232,35 @@ LOGGING = {
         "level": "INFO",
     },
 }
+
+# Reads inside core.db_router.replica_reads() go to the "replica" alias when
+# the environment settings define one. Users stay on the primary this long
+# after they write, which must exceed the replication lag.
+DATABASE_ROUTERS = ["core.db_router.PrimaryReplicaRouter"]
+REPLICA_PIN_SECONDS = 5
+
+# Set by core/asgi.py: the account read endpoints are served by async views
+# (accounts.async_views) instead of DRF's sync APIViews
+ASYNC_MODE = config("ASYNC_MODE", default=False, cast=bool)
+
+# Account event stream (accounts.events); served in ASYNC_MODE only, but
+# published by every process that changes lays or balances
+ACCOUNT_EVENTS_ENABLED = config("ACCOUNT_EVENTS_ENABLED", default=True, cast=bool)
+ACCOUNT_EVENTS_HEARTBEAT_SECONDS = 20  # below the router's 55s idle timeout
+ACCOUNT_EVENTS_STREAM_SECONDS = 300
+ACCOUNT_EVENTS_RETRY_MS = 3000
+ACCOUNT_EVENTS_QUEUE_SIZE = 100
+
+# Per-request metrics (core.middleware.RequestMetricsMiddleware)
+REQUEST_SERVER_TIMING = config("REQUEST_SERVER_TIMING", default=True, cast=bool)
+REQUEST_SLOW_MS = 500
+# Share of requests whose SQL is kept, to be logged if they turn out slow
+REQUEST_TRACE_SAMPLE_RATE = config("REQUEST_TRACE_SAMPLE_RATE", default=0.1, cast=float)
+REQUEST_TRACE_MAX_QUERIES = 200
+
+# Per-worker user cache (authentication.authentication.CachedJWTAuthentication)
+AUTH_USER_CACHE_SIZE = 10_000
+AUTH_USER_CACHE_TTL = 30
 # ---------------------------------------------------------------------------
 # Email backend – configuration for email support
 # ---------------------------------------------------------------------------
@@ -187,6 +273,18 @@ EMAIL_USE_SSL = True
 EMAIL_USE_TLS = False
 DEFAULT_FROM_EMAIL = EMAIL_HOST_USER
 
+# Outbox worker (authentication.services.EmailOutbox)
+EMAIL_OUTBOX_BATCH_SIZE = 50
+EMAIL_OUTBOX_MAX_ATTEMPTS = 8
+EMAIL_OUTBOX_RETRY_BASE_SECONDS = 30
+EMAIL_OUTBOX_RETRY_MAX_SECONDS = 60 * 60
+# How long a claimed batch is hidden from other workers while it is sent
+EMAIL_OUTBOX_LEASE_SECONDS = 10 * 60
+
+# Admin notifications are batched into one digest per window, except these
+ADMIN_DIGEST_WINDOW_SECONDS = 15 * 60
+ADMIN_NOTIFY_IMMEDIATE_EVENTS = ["withdraw_requested"]
+
 AUTH_USER_MODEL = 'authentication.CustomUser'
 
 CRONJOBS = [
@@ -21,6 +21,14 @@ DATABASES = {
         "PORT":     config("DB_PORT", "5432"),
     }
 }
+# Reads routed by core.db_router. A second connection to the same database
+# unless DB_REPLICA_HOST / DB_REPLICA_PORT point at a real replica.
+DATABASES["replica"] = {
+    **DATABASES["default"],
+    "HOST": config("DB_REPLICA_HOST", DATABASES["default"]["HOST"]),
+    "PORT": config("DB_REPLICA_PORT", DATABASES["default"]["PORT"]),
+    "TEST": {"MIRROR": "default"},
+}
 
 # ---------------------------------------------------------------------------
 # File storage – local filesystem
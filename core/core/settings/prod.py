@@ -11,10 +11,31 @@ DEBUG = False
 # ---------------------------------------------------------------------------
 # Database – Heroku connection string
 # ---------------------------------------------------------------------------
+# Persistent connections are per thread, and under ASGI every request runs
+# its ORM calls in a fresh thread, so they would pile up; pool them outside
+# Django (e.g. pgbouncer) instead
+conn_max_age = 0 if ASYNC_MODE else 600  # noqa: F405
 DATABASES = {
-    "default": dj_database_url.config(conn_max_age=600, ssl_require=True)
+    "default": dj_database_url.config(conn_max_age=conn_max_age, ssl_require=True)
 }
 
+# Follower database for the reads routed by core.db_router
+REPLICA_DATABASE_URL = config("REPLICA_DATABASE_URL", default="")
+if REPLICA_DATABASE_URL:
+    DATABASES["replica"] = {
+        **dj_database_url.parse(
+            REPLICA_DATABASE_URL,
+            conn_max_age=conn_max_age, ssl_require=True),
+        "TEST": {"MIRROR": "default"},
+    }
+
+# ---------------------------------------------------------------------------
+# Cache – shared by every dyno (see base.py); the release phase creates the
+# table for "database"
+# ---------------------------------------------------------------------------
+CACHE_BACKEND = config("CACHE_BACKEND", default="database")
+CACHES = {"default": cache_settings(CACHE_BACKEND)}  # noqa: F405
+
 # ---------------------------------------------------------------------------
 # Allowed hosts & security flags
 # ---------------------------------------------------------------------------
@@ -29,7 +50,6 @@ SECURE_HSTS_PRELOAD = True
 # -----------------------------------------------------------------------------
 # CORS / CSRF
 # -----------------------------------------------------------------------------
-FRONTEND_URL = config("FRONTEND_URL", "http://localhost:5173")
 BACKEND_URL = config("BACKEND_URL", "http://127.0.0.1:8000")
 
 def get_origin(url):
@@ -0,0 +1,87 @@
+import time
+
+import pytest
+from django.conf import settings
+from django.db import connections
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from accounts.models import Lay
+from authentication.models import CustomUser
+from .db_router import (
+    PrimaryReplicaRouter, is_pinned, pin_to_primary, replica_configured,
+    replica_reads)
+
+
+@pytest.fixture(scope="module")
+def replica(django_db_setup):
+    """
+    The "replica" alias, as a second connection to the test database when
+    the settings do not configure one. Module scoped, so the alias exists
+    before a test's database access is checked.
+    """
+    if replica_configured():
+        yield
+        return
+    replica = {**connections["default"].settings_dict, "TEST": {"MIRROR": "default"}}
+    with override_settings(DATABASES={**settings.DATABASES, "replica": replica}):
+        connections.settings["replica"] = replica
+        try:
+            yield
+        finally:
+            connections["replica"].close()
+            del connections["replica"]
+            del connections.settings["replica"]
+
+
+def test_replica_reads_stop_at_the_first_write(replica):
+    router = PrimaryReplicaRouter()
+    assert router.db_for_read(Lay) == "default"
+    with replica_reads():
+        assert router.db_for_read(Lay) == "replica"
+        assert router.db_for_write(Lay) == "default"
+        assert router.db_for_read(Lay) == "default"
+    assert router.db_for_read(Lay) == "default"
+
+
+def test_recent_changes_and_pinned_users_read_the_primary(replica):
+    router = PrimaryReplicaRouter()
+    with replica_reads(changed_at=time.time()):
+        assert router.db_for_read(Lay) == "default"
+    pin_to_primary("pinned")
+    with replica_reads(user_id="pinned"):
+        assert router.db_for_read(Lay) == "default"
+    with replica_reads(user_id="other", changed_at=time.time() - 60):
+        assert router.db_for_read(Lay) == "replica"
+
+
+@pytest.mark.django_db(transaction=True, databases=["default", "replica"])
+def test_account_info_is_read_from_the_replica(replica, settings):
+    settings.REPLICA_PIN_SECONDS = 0
+    user = CustomUser.objects.create_user(
+        email="replica@example.com", password="pass1234")
+    client = APIClient()
+    client.force_authenticate(user=user)
+
+    with CaptureQueriesContext(connections["replica"]) as replica:
+        with CaptureQueriesContext(connections["default"]) as primary:
+            res = client.get("/api/v1/account/info/")
+
+    assert res.status_code == 200
+    assert len(replica.captured_queries) > 0
+    assert len(primary.captured_queries) == 0
+
+
+def test_writing_request_pins_the_user_to_the_primary(replica, db):
+    user = CustomUser.objects.create_user(
+        email="pinned@example.com", password="pass1234")
+    client = APIClient()
+    client.force_authenticate(user=user)
+    assert not is_pinned(user.pk)
+
+    client.get("/api/v1/account/info/")
+    assert not is_pinned(user.pk)
+
+    client.post("/api/v1/account/deposit-click/", {"address": "addr"}, format="json")
+    assert is_pinned(user.pk)
@@ -0,0 +1,87 @@
+import logging
+
+import pytest
+from rest_framework.test import APIClient
+
+from authentication.models import CustomUser
+
+
+@pytest.fixture
+def client(db):
+    user = CustomUser.objects.create_user(
+        email="metrics@example.com", password="pass1234")
+    client = APIClient()
+    client.force_authenticate(user=user)
+    return client
+
+
+def test_server_timing_reports_db_and_cache(client):
+    res = client.get("/api/v1/account/info/")
+
+    timing = dict(
+        entry.split(";", 1) for entry in res["Server-Timing"].split(", "))
+    assert set(timing) >= {"db", "cache", "total"}
+    assert 'queries"' in timing["db"] and not timing["db"].endswith('"0 queries"')
+    assert "miss" in timing["cache"]
+
+
+def test_cache_metrics_follow_the_configured_backend(client, settings):
+    settings.CACHES = {
+        "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+
+    client.get("/api/v1/account/info/")
+    res = client.get("/api/v1/account/info/")
+
+    cache_timing = dict(
+        entry.split(";", 1) for entry in res["Server-Timing"].split(", "))["cache"]
+    assert 'desc="0 hit/' not in cache_timing
+
+
+def test_request_is_logged_with_metrics(client, caplog):
+    with caplog.at_level(logging.INFO, logger="core.requests"):
+        client.get("/api/v1/account/info/")
+
+    record = next(r for r in caplog.records if r.name == "core.requests")
+    assert record.request_metrics["path"] == "/api/v1/account/info/"
+    assert record.request_metrics["db_queries"] > 0
+
+
+def test_slow_sampled_request_logs_its_queries(client, caplog, settings):
+    settings.REQUEST_TRACE_SAMPLE_RATE = 1
+    settings.REQUEST_SLOW_MS = 0
+
+    with caplog.at_level(logging.INFO, logger="core.requests"):
+        client.get("/api/v1/account/info/")
+
+    slow = [r for r in caplog.records if r.levelno == logging.WARNING]
+    assert slow and "SELECT" in slow[0].getMessage()
+
+
+def test_metrics_endpoint_is_admin_only(client):
+    assert client.get("/metrics").status_code == 403
+
+
+def test_metrics_endpoint_exposes_business_counters(
+        db, django_capture_on_commit_callbacks):
+    from accounts.models import Lay
+    from authentication.models import OutboundEmail
+
+    staff = CustomUser.objects.create_user(
+        email="ops@example.com", password="pass1234", is_staff=True)
+    with django_capture_on_commit_callbacks(execute=True):
+        Lay.objects.create(
+            user=staff, total_odds=2, stake_amount=1, win_payout=2,
+            file_name="slip.jpg")
+    OutboundEmail.objects.create(
+        subject="s", body="b", from_email="f@example.com", recipients=[])
+    client = APIClient()
+    client.force_authenticate(user=staff)
+    client.get("/api/v1/account/info/")
+
+    res = client.get("/metrics")
+
+    assert res.status_code == 200
+    body = res.content.decode()
+    assert 'lays_created_total{status="pending"}' in body
+    assert 'email_outbox_depth{status="pending"} 1.0' in body
+    assert "http_request_duration_seconds_bucket" in body
@@ -0,0 +1,61 @@
+"""
+The admin-only `/metrics` endpoint serving the counters in core.metrics.
+"""
+import os
+
+from django.http import HttpResponse
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, generate_latest, multiprocess)
+from prometheus_client.core import GaugeMetricFamily
+from rest_framework.authentication import BasicAuthentication, SessionAuthentication
+from rest_framework.permissions import IsAdminUser
+from rest_framework.settings import api_settings
+from rest_framework.views import APIView
+
+from authentication.models import AdminNotification, OutboundEmail, OutboundEmailStatus
+
+
+class EmailQueueCollector:
+    """Outbox and digest queue depth, read from the database at scrape time."""
+
+    def collect(self):
+        outbox = GaugeMetricFamily(
+            "email_outbox_depth", "Outbound emails by status", labels=["status"])
+        for status in (OutboundEmailStatus.PENDING, OutboundEmailStatus.FAILED):
+            outbox.add_metric(
+                [status], OutboundEmail.objects.filter(status=status).count())
+        yield outbox
+        yield GaugeMetricFamily(
+            "admin_digest_pending", "Admin events waiting for the next digest",
+            value=AdminNotification.objects.filter(digested_at__isnull=True).count())
+
+
+class _InProcessCollector:
+    """This process's own metrics, when there is no multiprocess directory."""
+
+    def collect(self):
+        return REGISTRY.collect()
+
+
+def _registry():
+    registry = CollectorRegistry()
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry.register(_InProcessCollector())
+    registry.register(EmailQueueCollector())
+    return registry
+
+
+class MetricsView(APIView):
+    # Basic auth lets Prometheus scrape with a staff account
+    authentication_classes = [
+        *api_settings.DEFAULT_AUTHENTICATION_CLASSES,
+        BasicAuthentication,
+        SessionAuthentication,
+    ]
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return HttpResponse(
+            generate_latest(_registry()), content_type=CONTENT_TYPE_LATEST)
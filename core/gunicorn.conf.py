@@ -0,0 +1,34 @@
+"""
+Gunicorn settings for the web dyno (see Procfile). It serves the sync
+`core.wsgi` app, or with ASYNC_MODE set `core.asgi` on uvicorn workers;
+the platform only routes HTTP to `web`, so both modes run there.
+
+Prometheus metrics are kept in per-worker files under
+PROMETHEUS_MULTIPROC_DIR so `/metrics` can aggregate all workers. The
+directory is emptied when the master starts, and a worker's live files
+are released when it exits.
+"""
+import os
+import shutil
+
+import decouple
+from prometheus_client import multiprocess
+
+# Module names are read as gunicorn settings, and `config` is one of them
+if decouple.config("ASYNC_MODE", default=False, cast=bool):
+    wsgi_app = "core.asgi:application"
+    worker_class = "uvicorn_worker.UvicornWorker"
+else:
+    wsgi_app = "core.wsgi:application"
+
+multiproc_dir = os.environ.setdefault(
+    "PROMETHEUS_MULTIPROC_DIR", "/tmp/prometheus_multiproc")
+
+
+def on_starting(server):
+    shutil.rmtree(multiproc_dir, ignore_errors=True)
+    os.makedirs(multiproc_dir, exist_ok=True)
+
+
+def child_exit(server, worker):
+    multiprocess.mark_process_dead(worker.pid)